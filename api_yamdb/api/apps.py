@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import authentication
+        from .cache import connect_signals
+        from .profiling import install_query_observer
+        connect_signals()
+        authentication.connect_signals()
+        connection_created.connect(
+            install_query_observer, dispatch_uid='api_query_observer')
@@ -0,0 +1,52 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.urls import URLPattern
+from rest_framework.routers import DefaultRouter
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def run_read_view(view, request, *args, **kwargs):
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_view(view):
+    read = sync_to_async(run_read_view, thread_sensitive=False)
+    write = sync_to_async(view)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return await read(view, request, *args, **kwargs)
+        return await write(request, *args, **kwargs)
+
+    return wrapper
+
+
+class AsyncReadRouter(DefaultRouter):
+
+    def __init__(self, *args, async_basenames=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.async_basenames = async_basenames
+
+    def get_urls(self):
+        urls = super().get_urls()
+        return [self.to_async(url) for url in urls]
+
+    def to_async(self, url):
+        if not isinstance(url, URLPattern):
+            return url
+        basename = (url.name or '').rsplit('-', 1)[0]
+        if basename not in self.async_basenames:
+            return url
+        return URLPattern(
+            url.pattern, async_view(url.callback), url.default_args, url.name)
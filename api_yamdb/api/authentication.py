@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from reviews.models import User
+
+CLAIM_FIELDS = ('username', 'role', 'is_superuser', 'is_staff')
+VERSION_CLAIM = 'auth_version'
+
+
+def get_version_cache():
+    return caches[settings.AUTH_VERSION_CACHE]
+
+
+def user_version_key(user_id):
+    return f'api:user-version:{user_id}'
+
+
+class UserStateCache:
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.states = OrderedDict()
+
+    def get(self, user_id, version):
+        with self.lock:
+            entry = self.states.get(user_id)
+            if entry is None:
+                return None
+            entry_version, state, expires = entry
+            if entry_version != version or expires <= time.monotonic():
+                del self.states[user_id]
+                return None
+            self.states.move_to_end(user_id)
+            return state
+
+    def set(self, user_id, version, state):
+        expires = time.monotonic() + settings.AUTH_USER_STATE_TTL
+        with self.lock:
+            self.states[user_id] = (version, state, expires)
+            self.states.move_to_end(user_id)
+            while len(self.states) > self.max_size:
+                self.states.popitem(last=False)
+
+    def discard(self, user_id):
+        with self.lock:
+            self.states.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.states.clear()
+
+
+user_states = UserStateCache(settings.AUTH_USER_CACHE_SIZE)
+
+
+def remember_user(user):
+    get_version_cache().set(
+        user_version_key(user.pk), user.auth_version,
+        settings.AUTH_USER_STATE_TTL)
+    user_states.set(user.pk, user.auth_version, {
+        field: getattr(user, field) for field in User.AUTH_STATE_FIELDS})
+
+
+def forget_user(user_id):
+    get_version_cache().delete(user_version_key(user_id))
+    user_states.discard(user_id)
+
+
+def access_token_for(user):
+    token = RefreshToken.for_user(user).access_token
+    for field in CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    token[VERSION_CLAIM] = user.auth_version
+    remember_user(user)
+    return token
+
+
+def claims_state(token, version):
+    if token.get(VERSION_CLAIM) != version:
+        return None
+    if any(field not in token for field in CLAIM_FIELDS):
+        return None
+    state = {field: token[field] for field in CLAIM_FIELDS}
+    state['is_active'] = True
+    return state
+
+
+def principal(user_id, version, state):
+    values = {'id': user_id, 'auth_version': version, **state}
+    fields = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in values
+    ]
+    return User.from_db(
+        DEFAULT_DB_ALIAS, fields, [values[field] for field in fields])
+
+
+def check_active(is_active):
+    if not is_active:
+        raise AuthenticationFailed(
+            'Пользователь неактивен.', code='user_inactive')
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатор пользователя.')
+
+        version = get_version_cache().get(user_version_key(user_id))
+        state = None
+        if version is not None:
+            state = user_states.get(user_id, version)
+            state = state or claims_state(validated_token, version)
+        if state is None:
+            return self.load_user(user_id)
+        check_active(state['is_active'])
+        return principal(user_id, version, state)
+
+    def load_user(self, user_id):
+        user = User.objects.filter(pk=user_id).first()
+        if user is None:
+            raise AuthenticationFailed(
+                'Пользователь не найден.', code='user_not_found')
+        remember_user(user)
+        check_active(user.is_active)
+        return user
+
+
+def forget_saved_user(sender, instance, created, raw, **kwargs):
+    if not created and not raw:
+        transaction.on_commit(lambda: forget_user(instance.pk))
+
+
+def forget_deleted_user(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_user(user_id))
+
+
+def connect_signals():
+    post_save.connect(
+        forget_saved_user, sender=User,
+        dispatch_uid='api_auth_user_save')
+    post_delete.connect(
+        forget_deleted_user, sender=User,
+        dispatch_uid='api_auth_user_delete')
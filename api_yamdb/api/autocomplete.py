@@ -0,0 +1,95 @@
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from api_yamdb.db.replicas import served_from_replica
+
+from .cache import get_versions
+
+
+def prefix_keys(value):
+    words = value.casefold().split()
+    return {' '.join(words[start:]) for start in range(len(words))}
+
+
+class PrefixIndex:
+
+    def __init__(self, entries, items, version):
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.positions = [position for _, position in entries]
+        self.items = items
+        self.version = version
+        self.built = time.monotonic()
+        self.ttl = settings.AUTOCOMPLETE_INDEX_TTL
+        if served_from_replica():
+            self.ttl = min(self.ttl, settings.REPLICA_MAX_LAG)
+
+    @classmethod
+    def build(cls, queryset, serializer_class, fields, version):
+        objects = list(queryset)
+        items = serializer_class(objects, many=True).data
+        entries = [
+            (key, position)
+            for position, obj in enumerate(objects)
+            for field in fields
+            for key in prefix_keys(str(getattr(obj, field)))
+        ]
+        return cls(entries, items, version)
+
+    def is_stale(self, version):
+        age = time.monotonic() - self.built
+        return (
+            version != self.version
+            or age > self.ttl
+        )
+
+    def search(self, prefix):
+        prefix = ' '.join(prefix.casefold().split())
+        found = set()
+        for idx in range(bisect_left(self.keys, prefix), len(self.keys)):
+            if not self.keys[idx].startswith(prefix):
+                break
+            found.add(self.positions[idx])
+        return [self.items[position] for position in sorted(found)]
+
+
+indexes = {}
+indexes_lock = threading.Lock()
+
+
+def get_prefix_index(queryset, serializer_class, fields):
+    model = queryset.model
+    version = get_versions((model,))[0]
+    index = indexes.get(model)
+    if index is not None and not index.is_stale(version):
+        return index
+    with indexes_lock:
+        index = indexes.get(model)
+        if index is None or index.is_stale(version):
+            index = PrefixIndex.build(
+                queryset.all(), serializer_class, fields, version)
+            indexes[model] = index
+    return index
+
+
+class PrefixSearchMixin:
+    search_fields = ()
+
+    def list(self, request, *args, **kwargs):
+        search = request.query_params.get(api_settings.SEARCH_PARAM)
+        if not search:
+            return super().list(request, *args, **kwargs)
+
+        index = get_prefix_index(
+            self.get_queryset(), self.get_serializer_class(),
+            self.search_fields)
+        matches = index.search(search)
+        page = self.paginate_queryset(matches)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(matches)
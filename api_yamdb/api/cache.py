@@ -0,0 +1,108 @@
+import hashlib
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from rest_framework import status
+from rest_framework.response import Response
+
+from api_yamdb.db.replicas import (
+    is_pinned_to_primary, replica_cache_timeout
+)
+from reviews.models import Category, Genre, Review, Title
+from reviews.versions import catalog_imported
+
+CACHED_MODELS = (Category, Genre, Title, Review)
+
+
+def get_response_cache():
+    return caches[settings.API_RESPONSE_CACHE]
+
+
+def version_key(model):
+    return f'api:version:{model._meta.label_lower}'
+
+
+def invalidate(model):
+    get_response_cache().set(version_key(model), uuid4().hex, None)
+
+
+def get_versions(models):
+    cache = get_response_cache()
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+class CachedListMixin:
+    cache_models = ()
+    cache_key = None
+    validators = None
+
+    def get_cache_key(self, request):
+        versions = ':'.join(get_versions(self.cache_models))
+        digest = hashlib.md5(
+            f'{request.get_full_path()}|{versions}'.encode()).hexdigest()
+        return f'api:response:{digest}'
+
+    def get_cached_list(self):
+        if self.cache_key is None:
+            self.cache_key = self.get_cache_key(self.request)
+            self.cached_list = None
+            if not is_pinned_to_primary():
+                self.cached_list = get_response_cache().get(self.cache_key)
+        return self.cached_list
+
+    def list(self, request, *args, **kwargs):
+        cached = self.get_cached_list()
+        if cached is not None:
+            data, self.validators = cached
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache = get_response_cache()
+            cache.set(
+                self.cache_key, (response.data, self.validators),
+                replica_cache_timeout(cache))
+        return response
+
+
+def invalidate_on_commit(models, using=None):
+    def bump():
+        for model in models:
+            invalidate(model)
+    transaction.on_commit(bump, using=using)
+
+
+def invalidate_sender(sender, using=None, **kwargs):
+    invalidate_on_commit((sender,), using)
+
+
+def invalidate_titles(sender, using=None, **kwargs):
+    invalidate_on_commit((Title,), using)
+
+
+def invalidate_imported(sender, **kwargs):
+    invalidate_on_commit(CACHED_MODELS)
+
+
+def connect_signals():
+    catalog_imported.connect(
+        invalidate_imported, dispatch_uid='api_cache_import')
+    for model in CACHED_MODELS:
+        post_save.connect(
+            invalidate_sender, sender=model,
+            dispatch_uid=f'api_cache_save_{model._meta.label_lower}')
+        post_delete.connect(
+            invalidate_sender, sender=model,
+            dispatch_uid=f'api_cache_delete_{model._meta.label_lower}')
+    m2m_changed.connect(
+        invalidate_titles, sender=Title.genre.through,
+        dispatch_uid='api_cache_title_genre')
@@ -0,0 +1,63 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from reviews.models import Review, Title
+
+
+def title_validators(title_id):
+    try:
+        return Title.objects.filter(pk=title_id).values_list(
+            'version', 'modified').first()
+    except (TypeError, ValueError):
+        return None
+
+
+def review_validators(title_id, review_id):
+    try:
+        return Review.objects.filter(
+            pk=review_id, title_id=title_id
+        ).values_list('title__version', 'title__modified').first()
+    except (TypeError, ValueError):
+        return None
+
+
+def catalog_validators():
+    stats = Title.objects.aggregate(
+        count=Count('pk'), modified=Max('modified'))
+    return f'{stats["count"]}:{stats["modified"]}', stats['modified']
+
+
+class ConditionalGetMixin:
+
+    def get_validators(self):
+        raise NotImplementedError
+
+    def conditional(self, handler, request, *args, **kwargs):
+        self.validators = validators = self.get_validators()
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        version, modified = validators
+        digest = hashlib.md5(
+            f'{request.get_full_path()}|{version}'.encode()).hexdigest()
+        etag = f'"{digest}"'
+        last_modified = int(modified.timestamp()) if modified else None
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code < 400:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
@@ -1,8 +1,8 @@
 from django.conf import settings
-from django.core.mail import send_mail
 from django.shortcuts import get_object_or_404
 from django.utils.crypto import get_random_string
 
+from reviews.outbox import queue_email
 from .serializers import User
 
 
@@ -15,7 +15,7 @@ def email_generator(username):
     email_body = f'Ваш код подтверждения: {user.confirmation_code}'
     from_email = settings.DEFAULT_FROM_EMAIL
 
-    send_mail(
+    queue_email(
         email_subject,
         email_body,
         from_email,
@@ -1,17 +1,64 @@
+from django.db.models import Count
 from django_filters import FilterSet, CharFilter
 
-from reviews.models import Title
+from api_yamdb.db.replicas import (
+    is_pinned_to_primary, replica_cache_timeout
+)
+from reviews.models import Category, Genre, Title
+from reviews.search import search_titles
 
+from .cache import get_response_cache, get_versions
 
-def filter_by_slug(queryset, name, value):
-    return queryset.filter(**{f'{name}__slug': value})
+GENRE_MATCH_ALL = 'all'
+
+
+def slug_ids(model):
+    cache = get_response_cache()
+    version = get_versions((model,))[0]
+    key = f'api:slugs:{model._meta.label_lower}:{version}'
+    ids = None if is_pinned_to_primary() else cache.get(key)
+    if ids is None:
+        ids = dict(model.objects.values_list('slug', 'id'))
+        cache.set(key, ids, replica_cache_timeout(cache))
+    return ids
+
+
+def split_slugs(value):
+    return {slug.strip() for slug in value.split(',') if slug.strip()}
+
+
+def filter_by_category(queryset, name, value):
+    category_id = slug_ids(Category).get(value)
+    if category_id is None:
+        return queryset.none()
+    return queryset.filter(category_id=category_id)
+
+
+def filter_by_search(queryset, name, value):
+    return search_titles(queryset, value)
 
 
 class TitleFilter(FilterSet):
-    genre = CharFilter(method=filter_by_slug)
-    category = CharFilter(method=filter_by_slug)
+    genre = CharFilter(method='filter_by_genre')
+    category = CharFilter(method=filter_by_category)
     name = CharFilter(lookup_expr='icontains')
+    search = CharFilter(method=filter_by_search)
 
     class Meta:
         model = Title
         fields = ('genre', 'category', 'year', 'name')
+
+    def filter_by_genre(self, queryset, name, value):
+        slugs = split_slugs(value)
+        known_ids = slug_ids(Genre)
+        genre_ids = {known_ids[slug] for slug in slugs if slug in known_ids}
+        match_all = self.data.get('genre_match') == GENRE_MATCH_ALL
+        if not genre_ids or match_all and len(genre_ids) < len(slugs):
+            return queryset.none()
+
+        links = Title.genre.through.objects.filter(genre_id__in=genre_ids)
+        if match_all:
+            links = links.values('title_id').annotate(
+                matched=Count('genre_id')
+            ).filter(matched=len(genre_ids))
+        return queryset.filter(pk__in=links.values('title_id'))
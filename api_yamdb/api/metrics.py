@@ -0,0 +1,133 @@
+import os
+import time
+from functools import wraps
+
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram,
+    generate_latest, multiprocess
+)
+from prometheus_client.core import CounterMetricFamily
+
+from .profiling import query_stats, start_recording, stop_recording, view_tag
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+REQUESTS = Counter(
+    'api_requests_total', 'Количество HTTP-запросов.',
+    ('route', 'method', 'status'))
+LATENCY = Histogram(
+    'api_request_duration_seconds', 'Время обработки HTTP-запроса.',
+    ('route', 'method'))
+DB_QUERIES = Histogram(
+    'api_db_queries', 'Количество запросов к БД на один HTTP-запрос.',
+    ('route',), buckets=QUERY_BUCKETS)
+SERIALIZER_TIME = Histogram(
+    'api_serializer_duration_seconds', 'Время сериализации ответа.',
+    ('route',))
+RESPONSE_SIZE = Histogram(
+    'api_response_size_bytes', 'Размер тела ответа.',
+    ('route',), buckets=SIZE_BUCKETS)
+
+
+class QueryStatsCollector:
+    metrics = (
+        ('requests', 'api_sql_profile_requests',
+         'Количество HTTP-запросов, попавших в выборку профилировщика SQL.'),
+        ('queries', 'api_sql_profile_queries',
+         'Количество запросов к БД в выборке профилировщика SQL.'),
+        ('db_time', 'api_sql_profile_db_seconds',
+         'Время запросов к БД в выборке профилировщика SQL.'),
+        ('slow', 'api_sql_profile_slow_requests',
+         'Количество медленных HTTP-запросов в выборке профилировщика SQL.'),
+    )
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def collect(self):
+        snapshot = self.stats.snapshot()
+        for field, name, documentation in self.metrics:
+            family = CounterMetricFamily(
+                name, documentation, labels=('view',))
+            for tag, stats in snapshot.items():
+                family.add_metric((tag,), stats[field])
+            yield family
+
+
+QUERY_STATS = QueryStatsCollector(query_stats)
+REGISTRY.register(QUERY_STATS)
+
+
+def multiprocess_dir():
+    return (
+        os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+        or os.environ.get('prometheus_multiproc_dir')
+    )
+
+
+def metrics_view(request):
+    registry = REGISTRY
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(QUERY_STATS)
+    return HttpResponse(
+        generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware(MiddlewareMixin):
+
+    def process_request(self, request):
+        request.serializer_time = 0
+        request.metrics_recorder = start_recording()
+        request.metrics_started = time.perf_counter()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if view_func is not metrics_view:
+            request.metrics_route = view_tag(request, view_func)
+
+    def process_response(self, request, response):
+        recorder = getattr(request, 'metrics_recorder', None)
+        if recorder is None:
+            return response
+        stop_recording(recorder)
+        route = getattr(request, 'metrics_route', None)
+        if route is not None:
+            elapsed = time.perf_counter() - request.metrics_started
+            self.observe(
+                request, response, route, len(recorder.queries), elapsed)
+        return response
+
+    def observe(self, request, response, route, queries, elapsed):
+        REQUESTS.labels(route, request.method, response.status_code).inc()
+        LATENCY.labels(route, request.method).observe(elapsed)
+        DB_QUERIES.labels(route).observe(queries)
+        if request.serializer_time:
+            SERIALIZER_TIME.labels(route).observe(request.serializer_time)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(route).observe(len(response.content))
+
+
+def timed_representation(to_representation, request):
+    @wraps(to_representation)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return to_representation(*args, **kwargs)
+        finally:
+            request.serializer_time = getattr(
+                request, 'serializer_time', 0
+            ) + time.perf_counter() - started
+    return wrapper
+
+
+class SerializerMetricsMixin:
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        serializer.to_representation = timed_representation(
+            serializer.to_representation, self.request._request)
+        return serializer
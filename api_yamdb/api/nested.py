@@ -0,0 +1,9 @@
+from django.http import Http404
+
+
+class NestedListMixin:
+
+    def list(self, request, *args, **kwargs):
+        if self.validators is None:
+            raise Http404
+        return super().list(request, *args, **kwargs)
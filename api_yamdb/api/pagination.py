@@ -0,0 +1,46 @@
+from rest_framework.pagination import (
+    BasePagination, CursorPagination, LimitOffsetPagination,
+    PageNumberPagination
+)
+
+
+class PubDateCursorPagination(CursorPagination):
+    ordering = ('pub_date', 'id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class OptionalCursorPagination(BasePagination):
+    mode_query_param = 'pagination'
+    cursor_class = PubDateCursorPagination
+    fallback_class = PageNumberPagination
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.paginator = self.cursor_class()
+        else:
+            self.paginator = self.fallback_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.fallback_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return self.fallback_class().get_schema_operation_parameters(view)
+
+
+class ReviewPagination(OptionalCursorPagination):
+    fallback_class = LimitOffsetPagination
+
+
+class CommentPagination(OptionalCursorPagination):
+    fallback_class = PageNumberPagination
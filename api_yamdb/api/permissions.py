@@ -1,25 +1,42 @@
+from collections import namedtuple
+
 from rest_framework import permissions
 
+Access = namedtuple(
+    'Access', ('user_id', 'is_authenticated', 'is_staff', 'is_admin',
+               'is_moder'))
+
+ANONYMOUS = Access(None, False, False, False, False)
+
+
+def get_access(request):
+    access = getattr(request, 'access', None)
+    if access is None:
+        user = request.user
+        access = ANONYMOUS
+        if user.is_authenticated:
+            access = Access(
+                user.pk, True, user.is_staff, user.is_admin, user.is_moder)
+        request.access = access
+    return access
+
 
 class IsAdminOrReadOnly(permissions.BasePermission):
 
     def has_permission(self, request, view):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return request.user.is_authenticated and (
-            request.user.is_staff or request.user.is_admin)
+        access = get_access(request)
+        return access.is_staff or access.is_admin
 
 
 class HasPrevilegesOrReadOnly(permissions.BasePermission):
 
     def has_permission(self, request, view):
-        is_safe_method = request.method in permissions.SAFE_METHODS
-        is_auth = request.user.is_authenticated
-
-        return is_safe_method or is_auth and (
-            request.user.is_moder
-            or request.user.is_admin
-        )
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        access = get_access(request)
+        return access.is_moder or access.is_admin
 
 
 class AllowGetOrIsAdminOrDeny(permissions.BasePermission):
@@ -27,27 +44,27 @@ class AllowGetOrIsAdminOrDeny(permissions.BasePermission):
     def has_permission(self, request, view):
         if request.method == 'GET':
             return True
-        return request.user.is_authenticated and request.user.is_admin
+        return get_access(request).is_admin
 
 
 class IsAuthorOrHasAccess(permissions.BasePermission):
 
     def has_permission(self, request, view):
         is_safe_method = request.method in permissions.SAFE_METHODS
-        return is_safe_method or request.user.is_authenticated
+        return is_safe_method or get_access(request).is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        is_safe_method = request.method in permissions.SAFE_METHODS
-        is_auth = request.user.is_authenticated
-
-        return is_safe_method or is_auth and (
-            request.user.is_moder
-            or request.user.is_admin
-            or obj.author == request.user
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        access = get_access(request)
+        return access.is_authenticated and (
+            access.is_moder
+            or access.is_admin
+            or obj.author_id == access.user_id
         )
 
 
 class IsAdminOrDeny(permissions.BasePermission):
 
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.is_admin
+        return get_access(request).is_admin
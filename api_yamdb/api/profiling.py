@@ -0,0 +1,154 @@
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+
+from asgiref.local import Local
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+logger = logging.getLogger('api.profiling')
+
+SQL_STRING = re.compile(r"'(?:[^']|'')*'")
+SQL_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+SQL_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+SQL_SPACES = re.compile(r'\s+')
+SLOW_LOG_FINGERPRINTS = 5
+
+
+def fingerprint(sql):
+    sql = SQL_STRING.sub('?', sql)
+    sql = SQL_NUMBER.sub('?', sql.replace('%s', '?'))
+    sql = SQL_IN_LIST.sub('(...)', sql)
+    return SQL_SPACES.sub(' ', sql).strip()
+
+
+def view_tag(request, view_func):
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return getattr(view_func, '__name__', 'unknown')
+    method = request.method.lower()
+    action = (getattr(view_func, 'actions', None) or {}).get(method, method)
+    return f'{view_class.__name__}.{action}'
+
+
+class QueryStats:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def add(self, tag, queries, db_time, slow):
+        with self.lock:
+            stats = self.views.setdefault(tag, {
+                'requests': 0, 'queries': 0, 'db_time': 0.0, 'slow': 0})
+            stats['requests'] += 1
+            stats['queries'] += queries
+            stats['db_time'] += db_time
+            stats['slow'] += slow
+
+    def snapshot(self):
+        with self.lock:
+            return {tag: dict(stats) for tag, stats in self.views.items()}
+
+    def reset(self):
+        with self.lock:
+            self.views = {}
+
+
+query_stats = QueryStats()
+
+
+recording = Local()
+
+
+class QueryRecorder:
+
+    def __init__(self):
+        self.queries = []
+
+    def add(self, sql, duration):
+        self.queries.append((sql, duration))
+
+    @property
+    def db_time(self):
+        return sum(duration for _, duration in self.queries)
+
+
+def start_recording():
+    recorder = QueryRecorder()
+    recording.recorders = getattr(recording, 'recorders', ()) + (recorder,)
+    return recorder
+
+
+def stop_recording(recorder):
+    recording.recorders = tuple(
+        active for active in getattr(recording, 'recorders', ())
+        if active is not recorder
+    )
+
+
+def observe_query(execute, sql, params, many, context):
+    recorders = getattr(recording, 'recorders', ())
+    if not recorders:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        for recorder in recorders:
+            recorder.add(sql, duration)
+
+
+def install_query_observer(sender, connection, **kwargs):
+    if observe_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, observe_query)
+
+
+class SqlProfilingMiddleware(MiddlewareMixin):
+
+    def process_request(self, request):
+        if self.is_sampled():
+            request.query_recorder = start_recording()
+
+    def process_response(self, request, response):
+        recorder = getattr(request, 'query_recorder', None)
+        if recorder is not None:
+            stop_recording(recorder)
+            self.record(request, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.profiling_tag = view_tag(request, view_func)
+
+    def is_sampled(self):
+        if not getattr(settings, 'SQL_PROFILING_ENABLED', False):
+            return False
+        return random.random() < settings.SQL_PROFILING_SAMPLE_RATE
+
+    def record(self, request, recorder):
+        tag = getattr(request, 'profiling_tag', 'unresolved')
+        db_time = recorder.db_time
+        slow = (
+            len(recorder.queries) >= settings.SQL_PROFILING_SLOW_QUERIES
+            or db_time * 1000 >= settings.SQL_PROFILING_SLOW_DB_MS
+        )
+        query_stats.add(tag, len(recorder.queries), db_time, slow)
+        if slow:
+            self.log_slow(request, tag, recorder)
+
+    def log_slow(self, request, tag, recorder):
+        fingerprints = Counter(
+            fingerprint(sql) for sql, _ in recorder.queries)
+        logger.warning(
+            'Медленный запрос %s %s (%s): %d запросов к БД, %.1f мс\n%s',
+            request.method, request.path, tag, len(recorder.queries),
+            recorder.db_time * 1000,
+            '\n'.join(
+                f'{count} x {sql}' for sql, count
+                in fingerprints.most_common(SLOW_LOG_FINGERPRINTS)
+            ),
+        )
@@ -27,15 +27,13 @@ class GenreSerializer(serializers.ModelSerializer):
 class CategoryField(serializers.SlugRelatedField):
 
     def to_representation(self, value):
-        serializer = CategorySerializer(value)
-        return serializer.data
+        return {'name': value.name, 'slug': value.slug}
 
 
 class GenreField(serializers.SlugRelatedField):
 
     def to_representation(self, value):
-        serializer = GenreSerializer(value)
-        return serializer.data
+        return {'name': value.name, 'slug': value.slug}
 
 
 class StringToGenreField(serializers.StringRelatedField):
@@ -65,10 +63,6 @@ class TitleSerializer(serializers.ModelSerializer):
         allow_empty=False,
         many=True
     )
-    rating = serializers.IntegerField(
-        source='reviews__score__avg',
-        read_only=True
-    )
 
     def validate_genre(self, value):
         if not value:
@@ -79,7 +73,10 @@ class TitleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = (
+            'id', 'name', 'year', 'rating', 'description', 'genre',
+            'category',
+        )
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -130,21 +127,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date')
 
-    def validate(self, data):
-        if self.context.get('request').method != 'POST':
-            return data
-
-        title_id = self.context['view'].kwargs.get('title_id')
-        user = self.context.get('request').user
-
-        if self.Meta.model.objects.filter(
-                title_id=title_id,
-                author=user).exists():
-            raise ValidationError('Вы не можете оставлять более одного '
-                                  'отзыва на одно произведение!')
-
-        return data
-
 
 class CommentSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
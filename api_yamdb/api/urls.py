@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
 
+from .async_views import AsyncReadRouter
 from .views import (
     GenreViewSet,
     CategoryViewSet,
@@ -12,7 +13,10 @@ from .views import (
     CommentViewSet
 )
 
-router_v1 = DefaultRouter()
+ASYNC_BASENAMES = ('categories', 'genres', 'titles', 'reviews', 'comments')
+
+router_v1 = AsyncReadRouter(
+    async_basenames=ASYNC_BASENAMES if settings.API_ASYNC_VIEWS else ())
 
 router_v1.register(r'categories', CategoryViewSet, basename='categories')
 router_v1.register(r'genres', GenreViewSet, basename='genres')
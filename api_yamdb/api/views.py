@@ -1,14 +1,14 @@
+from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
-from django.db.models import Avg
 from rest_framework import mixins, viewsets, filters, status, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.views import APIView
-from rest_framework.pagination import LimitOffsetPagination
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Genre, Title, Review
+from reviews.models import Category, Comment, Genre, Title, Review
 from .serializers import (
     GenreSerializer,
     CategorySerializer,
@@ -27,41 +27,73 @@ from .permissions import (
     AllowGetOrIsAdminOrDeny,
     IsAuthorOrHasAccess,
 )
+from .authentication import access_token_for
+from .autocomplete import PrefixSearchMixin
+from .cache import CachedListMixin
+from .conditional import (
+    ConditionalGetMixin, catalog_validators, review_validators,
+    title_validators
+)
 from .filters import TitleFilter
+from .metrics import SerializerMetricsMixin
+from .nested import NestedListMixin
+from .pagination import CommentPagination, ReviewPagination
 from .email_utils import email_generator
 
 
-class CategoryViewSet(mixins.CreateModelMixin,
+class CategoryViewSet(SerializerMetricsMixin, PrefixSearchMixin,
+                      CachedListMixin,
+                      mixins.CreateModelMixin,
                       mixins.ListModelMixin,
                       mixins.DestroyModelMixin,
                       viewsets.GenericViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (AllowGetOrIsAdminOrDeny,)
-    filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    cache_models = (Category,)
 
 
-class GenreViewSet(mixins.CreateModelMixin,
+class GenreViewSet(SerializerMetricsMixin, PrefixSearchMixin,
+                   CachedListMixin,
+                   mixins.CreateModelMixin,
                    mixins.ListModelMixin,
                    mixins.DestroyModelMixin,
                    viewsets.GenericViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (AllowGetOrIsAdminOrDeny,)
-    filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    cache_models = (Genre,)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        Avg('reviews__score'))
+class TitleViewSet(SerializerMetricsMixin, ConditionalGetMixin,
+                   CachedListMixin, viewsets.ModelViewSet):
+    queryset = Title.objects.select_related(
+        'category').prefetch_related('genre')
     permission_classes = (IsAdminOrReadOnly,)
     serializer_class = TitleSerializer
     http_method_names = ('get', 'post', 'patch', 'delete',)
     filterset_class = TitleFilter
+    cache_models = (Title, Category, Genre, Review)
+
+    title = None
+
+    def get_object(self):
+        if self.title is None:
+            self.title = super().get_object()
+        return self.title
+
+    def get_validators(self):
+        if self.action == 'retrieve':
+            title = self.get_object()
+            return title.version, title.modified
+        cached = self.get_cached_list()
+        if cached is not None:
+            return cached[1]
+        return catalog_validators()
 
 
 class UserRegistrationView(APIView):
@@ -82,7 +114,7 @@ class UserRegistrationView(APIView):
         return Response(serializer.data)
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(SerializerMetricsMixin, ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (IsAdminOrDeny,)
@@ -97,7 +129,9 @@ class UserViewSet(ModelViewSet):
             permission_classes=(permissions.IsAuthenticated,),
             serializer_class=UserMeSerializer)
     def me(self, request):
-        user = self.request.user
+        user = request.user
+        if user.get_deferred_fields():
+            user = get_object_or_404(User, pk=user.pk)
         serializer = self.get_serializer(
             user, data=request.data, partial=True)
 
@@ -120,43 +154,84 @@ class TokenObtainView(APIView):
 
         user = serializer.validated_data['user']
 
-        token = RefreshToken.for_user(user)
+        token = access_token_for(user)
         return Response(
-            {'token': str(token.access_token)},
+            {'token': str(token)},
             status=status.HTTP_200_OK
         )
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(SerializerMetricsMixin, ConditionalGetMixin,
+                    NestedListMixin, viewsets.ModelViewSet):
     permission_classes = (IsAuthorOrHasAccess,)
     serializer_class = ReviewSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = ReviewPagination
     http_method_names = ('get', 'post', 'patch', 'delete')
+    list_fields = (
+        'id', 'title_id', 'text', 'score', 'pub_date', 'author__username')
+
+    title = None
 
     def get_title(self):
-        return get_object_or_404(
-            Title, id=self.kwargs.get('title_id'))
+        if self.title is None:
+            self.title = get_object_or_404(
+                Title, id=self.kwargs.get('title_id'))
+        return self.title
+
+    def get_validators(self):
+        return title_validators(self.kwargs.get('title_id'))
 
     def get_queryset(self):
+        if self.action == 'list':
+            return Review.objects.filter(
+                title_id=self.kwargs.get('title_id')
+            ).select_related('author').only(*self.list_fields)
         return self.get_title().reviews.all()
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user,
-                        title=self.get_title())
-
-
-class CommentViewSet(ModelViewSet):
+        title = self.get_title()
+        try:
+            serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            if not title.reviews.filter(
+                    author_id=self.request.user.pk).exists():
+                raise
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Вы не можете оставлять более одного '
+                    'отзыва на одно произведение!'
+                ]
+            })
+
+
+class CommentViewSet(SerializerMetricsMixin, ConditionalGetMixin,
+                     NestedListMixin, ModelViewSet):
     serializer_class = CommentSerializer
+    pagination_class = CommentPagination
     permission_classes = (IsAuthorOrHasAccess,)
     http_method_names = ('get', 'post', 'patch', 'delete')
+    list_fields = ('id', 'review_id', 'text', 'pub_date', 'author__username')
 
-    def get_review(self):
-        review_id = self.kwargs.get('review_id')
-        title_id = self.kwargs.get('title_id')
+    review = None
 
-        return get_object_or_404(Review, pk=review_id, title_id=title_id)
+    def get_review(self):
+        if self.review is None:
+            self.review = get_object_or_404(
+                Review,
+                pk=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+        return self.review
+
+    def get_validators(self):
+        return review_validators(
+            self.kwargs.get('title_id'), self.kwargs.get('review_id'))
 
     def get_queryset(self):
+        if self.action == 'list':
+            return Comment.objects.filter(
+                review_id=self.kwargs.get('review_id')
+            ).select_related('author').only(*self.list_fields)
         return self.get_review().comments.all()
 
     def perform_create(self, serializer):
@@ -0,0 +1,87 @@
+import queue
+import threading
+import time
+
+from django.db.utils import OperationalError
+
+
+def ping(connection):
+    try:
+        cursor = connection.cursor()
+        try:
+            cursor.execute('SELECT 1')
+        finally:
+            cursor.close()
+    except Exception:
+        return False
+    return True
+
+
+def close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+
+    def __init__(self, connect, max_size, timeout=10, check_idle=30,
+                 reset=None):
+        self.connect = connect
+        self.timeout = timeout
+        self.check_idle = check_idle
+        self.reset = reset
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.idle = queue.LifoQueue()
+        self.closed = False
+
+    def acquire(self):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise OperationalError(
+                f'Нет свободных соединений с БД за {self.timeout} с')
+        try:
+            return self.checkout()
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def checkout(self):
+        while True:
+            try:
+                connection, released = self.idle.get_nowait()
+            except queue.Empty:
+                return self.connect()
+            idle_for = time.monotonic() - released
+            if idle_for < self.check_idle or ping(connection):
+                return connection
+            close_quietly(connection)
+
+    def is_reusable(self, connection):
+        if self.reset is None:
+            return True
+        try:
+            return self.reset(connection)
+        except Exception:
+            return False
+
+    def release(self, connection):
+        try:
+            if not self.closed and self.is_reusable(connection):
+                self.idle.put((connection, time.monotonic()))
+            else:
+                close_quietly(connection)
+        finally:
+            self.slots.release()
+
+    def close_idle(self):
+        while True:
+            try:
+                connection, _ = self.idle.get_nowait()
+            except queue.Empty:
+                return
+            close_quietly(connection)
+
+    def close(self):
+        self.closed = True
+        self.close_idle()
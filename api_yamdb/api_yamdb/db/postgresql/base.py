@@ -0,0 +1,89 @@
+import os
+import threading
+
+import psycopg2.extras
+from django.db.backends.postgresql import base, creation
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from ..pool import ConnectionPool
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def connect(conn_params, options):
+    connection = base.Database.connect(**conn_params)
+    isolation_level = options.get('isolation_level')
+    if (
+        isolation_level is not None
+        and isolation_level != connection.isolation_level
+    ):
+        connection.set_session(isolation_level=isolation_level)
+    psycopg2.extras.register_default_jsonb(
+        conn_or_curs=connection, loads=lambda x: x)
+    return connection
+
+
+def close_pool(alias):
+    with pools_lock:
+        _, pool = pools.pop((os.getpid(), alias), (None, None))
+    if pool is not None:
+        pool.close()
+
+
+def reset(connection):
+    if connection.closed:
+        return False
+    if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+    return True
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        close_pool(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+    pool = None
+
+    def get_pool(self, conn_params):
+        pool_settings = self.settings_dict.get('POOL') or {}
+        if not pool_settings.get('MAX_SIZE'):
+            return None
+        key = (os.getpid(), self.alias)
+        with pools_lock:
+            params, pool = pools.get(key, (None, None))
+            if pool is not None and params != conn_params:
+                pool.close()
+                pool = None
+            if pool is None:
+                options = self.settings_dict['OPTIONS']
+                params = dict(conn_params)
+                pool = ConnectionPool(
+                    lambda: connect(params, options),
+                    pool_settings['MAX_SIZE'],
+                    timeout=pool_settings.get('TIMEOUT', 10),
+                    check_idle=pool_settings.get('CHECK_IDLE', 30),
+                    reset=reset,
+                )
+                pools[key] = (params, pool)
+            return pool
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        if self.pool is None:
+            return super().get_new_connection(conn_params)
+        connection = self.pool.acquire()
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level', connection.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            self.pool.release(self.connection)
@@ -0,0 +1,139 @@
+import hashlib
+import time
+from itertools import count
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.deprecation import MiddlewareMixin
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+POSTGRESQL_LAG_SQL = (
+    'SELECT COALESCE(EXTRACT(EPOCH FROM '
+    'now() - pg_last_xact_replay_timestamp()), 0)'
+)
+
+state = Local()
+lag_checks = {}
+rotation = count()
+
+
+def measure_lag(alias):
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(POSTGRESQL_LAG_SQL)
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        return None
+
+
+def is_fresh(alias):
+    now = time.monotonic()
+    checked_at, lag = lag_checks.get(alias, (None, None))
+    interval = settings.REPLICA_LAG_CHECK_INTERVAL
+    if checked_at is None or now - checked_at > interval:
+        lag = measure_lag(alias)
+        lag_checks[alias] = (now, lag)
+    return lag is not None and lag <= settings.REPLICA_MAX_LAG
+
+
+def choose_replica():
+    replicas = [
+        alias for alias in settings.DATABASE_REPLICAS if is_fresh(alias)
+    ]
+    if not replicas:
+        return DEFAULT_DB_ALIAS
+    return replicas[next(rotation) % len(replicas)]
+
+
+def is_pinned_to_primary():
+    return getattr(state, 'pinned', False)
+
+
+def served_from_replica():
+    return getattr(state, 'read_replica', False)
+
+
+def replica_cache_timeout(cache):
+    if not served_from_replica():
+        return DEFAULT_TIMEOUT
+    if cache.default_timeout is None:
+        return settings.REPLICA_MAX_LAG
+    return min(cache.default_timeout, settings.REPLICA_MAX_LAG)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if not getattr(state, 'allow_replica', False):
+            return DEFAULT_DB_ALIAS
+        alias = getattr(state, 'replica', DEFAULT_DB_ALIAS)
+        if alias != DEFAULT_DB_ALIAS:
+            state.read_replica = True
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state.allow_replica = False
+        state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+def get_pin_cache():
+    return caches[settings.REPLICA_PIN_CACHE]
+
+
+def pin_key(request):
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if not authorization:
+        return None
+    digest = hashlib.md5(authorization.encode()).hexdigest()
+    return f'replicas:pin:{digest}'
+
+
+def is_pinned(request):
+    if request.COOKIES.get(settings.REPLICA_PIN_COOKIE):
+        return True
+    key = pin_key(request)
+    return key is not None and get_pin_cache().get(key) is not None
+
+
+def pin(request, response):
+    response.set_cookie(
+        settings.REPLICA_PIN_COOKIE, '1',
+        max_age=settings.REPLICA_PIN_SECONDS, httponly=True)
+    key = pin_key(request)
+    if key is not None:
+        get_pin_cache().set(key, True, settings.REPLICA_PIN_SECONDS)
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+
+    def process_request(self, request):
+        state.pinned = bool(settings.DATABASE_REPLICAS) and is_pinned(request)
+        state.allow_replica = (
+            bool(settings.DATABASE_REPLICAS)
+            and request.method in SAFE_METHODS
+            and not state.pinned
+        )
+        state.replica = (
+            choose_replica() if state.allow_replica else DEFAULT_DB_ALIAS)
+        state.wrote = False
+        state.read_replica = False
+
+    def process_response(self, request, response):
+        if getattr(state, 'wrote', False):
+            pin(request, response)
+        state.allow_replica = False
+        state.replica = DEFAULT_DB_ALIAS
+        state.pinned = False
+        state.wrote = False
+        state.read_replica = False
+        return response
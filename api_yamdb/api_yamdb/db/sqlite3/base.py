@@ -0,0 +1,22 @@
+from django.db.backends.sqlite3 import base
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+FILE_ONLY_PRAGMAS = ('journal_mode',)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        pragmas = self.settings_dict.get('PRAGMAS', DEFAULT_PRAGMAS)
+        in_memory = self.is_in_memory_db()
+        for name, value in pragmas.items():
+            if in_memory and name in FILE_ONLY_PRAGMAS:
+                continue
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from .models import Category, Genre, Title, User, Review, Comment
+from .models import (
+    Category, Genre, Title, User, Review, Comment, OutgoingEmail
+)
 
 
 admin.site.register(Category)
@@ -9,3 +11,4 @@ admin.site.register(Title)
 admin.site.register(User)
 admin.site.register(Review)
 admin.site.register(Comment)
+admin.site.register(OutgoingEmail)
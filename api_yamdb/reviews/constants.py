@@ -3,3 +3,4 @@ SLAG_LENGTH = 50
 ROLE_LENGTH = 10
 CODE_LENGTH = 15
 USER_LENGTH = 150
+STATUS_LENGTH = 10
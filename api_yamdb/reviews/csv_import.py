@@ -0,0 +1,368 @@
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.core.management.color import no_style
+from django.db import DatabaseError, connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import Category, Comment, Genre, Review, Title, User
+from .ratings import rebuild_ratings
+from .search import rebuild_search_index
+from .versions import catalog_imported, touch_titles
+
+DEFAULT_CHUNK_SIZE = 1000
+ID_LOOKUP_BATCH = 500
+
+
+class RowError(Exception):
+    pass
+
+
+def to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RowError(f'ожидалось целое число, получено `{value}`')
+
+
+def to_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_str(value):
+    return value or ''
+
+
+def to_datetime(value):
+    parsed = parse_datetime(value or '')
+    if parsed is None:
+        raise RowError(f'некорректная дата `{value}`')
+    return parsed
+
+
+class CsvSpec:
+
+    def __init__(self, filename, model, columns, foreign_keys=None,
+                 depends_on=(), parallel=False):
+        self.filename = filename
+        self.model = model
+        self.columns = columns
+        self.foreign_keys = foreign_keys or {}
+        self.depends_on = depends_on
+        self.parallel = parallel
+
+    @property
+    def update_fields(self):
+        return [field for field, _, _ in self.columns] + list(
+            self.foreign_keys)
+
+    def key_values(self, row):
+        return {'id': to_int(row.get('id'))}
+
+    def build(self, row, known_ids):
+        values = self.key_values(row)
+        for field, column, convert in self.columns:
+            values[field] = convert(row.get(column))
+        for field, (column, related_model) in self.foreign_keys.items():
+            raw_value = row.get(column)
+            if not raw_value and self.model._meta.get_field(field).null:
+                values[f'{field}_id'] = None
+                continue
+            related_id = to_int(raw_value)
+            if related_id not in known_ids[related_model]:
+                raise RowError(
+                    f'{related_model._meta.verbose_name} '
+                    f'{related_id} не найден(а)')
+            values[f'{field}_id'] = related_id
+        return self.model(**values)
+
+    def describe(self, obj):
+        return f'id={obj.pk}'
+
+    def existing(self, objects):
+        return existing_ids(self.model, [obj.pk for obj in objects])
+
+    def write(self, objects, existing):
+        self.model.objects.bulk_update(
+            [obj for obj in objects if obj.pk in existing],
+            self.update_fields)
+        self.model.objects.bulk_create(
+            [obj for obj in objects if obj.pk not in existing])
+
+
+class LinkSpec(CsvSpec):
+
+    def key_values(self, row):
+        return {}
+
+    def describe(self, obj):
+        return ', '.join(
+            f'{field}_id={getattr(obj, f"{field}_id")}'
+            for field in self.foreign_keys
+        )
+
+    def existing(self, objects):
+        return None
+
+    def write(self, objects, existing):
+        self.model.objects.bulk_create(objects, ignore_conflicts=True)
+
+
+CSV_SPECS = (
+    CsvSpec('category.csv', Category, (
+        ('name', 'name', to_str),
+        ('slug', 'slug', to_str),
+    )),
+    CsvSpec('genre.csv', Genre, (
+        ('name', 'name', to_str),
+        ('slug', 'slug', to_str),
+    )),
+    CsvSpec('users.csv', User, (
+        ('username', 'username', to_str),
+        ('email', 'email', to_str),
+        ('role', 'role', to_str),
+        ('bio', 'bio', to_str),
+        ('first_name', 'first_name', to_str),
+        ('last_name', 'last_name', to_str),
+    )),
+    CsvSpec('titles.csv', Title, (
+        ('name', 'name', to_str),
+        ('year', 'year', to_int),
+    ), {'category': ('category', Category)},
+        depends_on=('category.csv',),
+        parallel=True),
+    CsvSpec('review.csv', Review, (
+        ('text', 'text', to_str),
+        ('score', 'score', to_int),
+        ('pub_date', 'pub_date', to_datetime),
+    ), {'title': ('title_id', Title), 'author': ('author', User)},
+        depends_on=('titles.csv', 'users.csv'),
+        parallel=True),
+    CsvSpec('comments.csv', Comment, (
+        ('text', 'text', to_str),
+        ('pub_date', 'pub_date', to_datetime),
+    ), {'review': ('review_id', Review), 'author': ('author', User)},
+        depends_on=('review.csv', 'users.csv'),
+        parallel=True),
+    LinkSpec('genre_title.csv', Title.genre.through, (), {
+        'title': ('title_id', Title), 'genre': ('genre_id', Genre)},
+        depends_on=('titles.csv', 'genre.csv'),
+        parallel=True),
+)
+
+SPECS_BY_FILENAME = {spec.filename: spec for spec in CSV_SPECS}
+
+
+class ImportStats:
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.rows = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self.elapsed = 0
+
+    def finish(self):
+        self.elapsed = time.monotonic() - self.started
+        return self
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0
+
+    def add(self, other):
+        self.rows += other.rows
+        self.errors += other.errors
+
+
+def load_known_ids(spec):
+    return {
+        related_model: set(
+            related_model.objects.values_list('id', flat=True))
+        for _, related_model in spec.foreign_keys.values()
+    }
+
+
+def load_chunk_ids(spec, rows):
+    known_ids = {}
+    for column, related_model in spec.foreign_keys.values():
+        ids = {to_id(row.get(column)) for row in rows} - {None}
+        known_ids.setdefault(related_model, set()).update(
+            existing_ids(related_model, list(ids)))
+    return known_ids
+
+
+def existing_ids(model, ids):
+    found = set()
+    for start in range(0, len(ids), ID_LOOKUP_BATCH):
+        found.update(model.objects.filter(
+            pk__in=ids[start:start + ID_LOOKUP_BATCH]
+        ).values_list('pk', flat=True))
+    return found
+
+
+@contextmanager
+def keep_imported_dates(model):
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def write_rows_one_by_one(spec, objects, existing, report_error):
+    written = 0
+    for obj in objects:
+        try:
+            with transaction.atomic():
+                spec.write([obj], existing)
+        except DatabaseError as e:
+            report_error(f'{spec.filename}, {spec.describe(obj)}: {e}')
+        else:
+            written += 1
+    return written
+
+
+def write_objects(spec, objects, report_error):
+    existing = spec.existing(objects)
+    with keep_imported_dates(spec.model):
+        try:
+            with transaction.atomic():
+                spec.write(objects, existing)
+        except DatabaseError:
+            return write_rows_one_by_one(
+                spec, objects, existing, report_error)
+    return len(objects)
+
+
+def import_rows(spec, rows, report_error, chunk_size=DEFAULT_CHUNK_SIZE,
+                known_ids=None, per_chunk_ids=False, on_chunk_done=None):
+    stats = ImportStats(spec.filename)
+    if known_ids is None and not per_chunk_ids:
+        known_ids = load_known_ids(spec)
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        chunk_ids = load_chunk_ids(spec, chunk) if per_chunk_ids else known_ids
+        objects = []
+        for row in chunk:
+            try:
+                objects.append(spec.build(row, chunk_ids))
+            except RowError as e:
+                stats.errors += 1
+                report_error(f'{spec.filename}, id={row.get("id")}: {e}')
+        if objects:
+            written = write_objects(spec, objects, report_error)
+            stats.rows += written
+            stats.errors += len(objects) - written
+        if on_chunk_done is not None:
+            on_chunk_done()
+    return stats.finish()
+
+
+class CsvStream:
+
+    def __init__(self, file, offset=0, end=None):
+        self.file = file
+        self.header = next(csv.reader([file.readline().decode('utf-8-sig')]))
+        if offset:
+            file.seek(offset)
+        self.position = file.tell()
+        self.end = end
+
+    def lines(self):
+        while self.end is None or self.position < self.end:
+            line = self.file.readline()
+            if not line:
+                break
+            self.position = self.file.tell()
+            yield line.decode('utf-8')
+
+    def __iter__(self):
+        for values in csv.reader(self.lines()):
+            if values:
+                yield dict(zip(self.header, values))
+
+
+class ImportCheckpoint:
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, encoding='utf-8') as file:
+                self.files = json.load(file)
+        except (IOError, ValueError):
+            self.files = {}
+
+    def offset(self, filename, size):
+        saved = self.files.get(filename) or {}
+        if saved.get('size') != size:
+            return 0
+        return saved.get('offset', 0)
+
+    def save(self, filename, offset, size):
+        self.files[filename] = {'offset': offset, 'size': size}
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.files, file)
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        self.files = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def import_stream(spec, path, report_error, checkpoint,
+                  chunk_size=DEFAULT_CHUNK_SIZE):
+    size = os.path.getsize(path)
+    with open(path, 'rb') as file:
+        stream = CsvStream(file, checkpoint.offset(spec.filename, size))
+        stats = import_rows(
+            spec, stream, report_error, chunk_size, per_chunk_ids=True,
+            on_chunk_done=lambda: checkpoint.save(
+                spec.filename, stream.position, size))
+    checkpoint.save(spec.filename, size, size)
+    finish_import(spec)
+    return stats
+
+
+def finish_import(spec):
+    if spec.model is Review:
+        rebuild_ratings()
+    else:
+        touch_titles(Title.objects.all())
+    if spec.model is Title:
+        rebuild_search_index()
+    catalog_imported.send(sender=spec.model)
+
+
+def import_file(spec, path, report_error, chunk_size=DEFAULT_CHUNK_SIZE):
+    with open(path, encoding='utf-8', newline='') as file:
+        stats = import_rows(
+            spec, csv.DictReader(file), report_error, chunk_size)
+    finish_import(spec)
+    return stats
+
+
+def reset_sequences(models):
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
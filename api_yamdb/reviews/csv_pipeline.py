@@ -0,0 +1,135 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.db import connections
+
+
+def init_worker():
+    import django
+    django.setup()
+    connections.close_all()
+
+
+def split_ranges(path, parts):
+    size = os.path.getsize(path)
+    with open(path, 'rb') as file:
+        file.readline()
+        start = file.tell()
+        offsets = [start]
+        quotes = 0
+        while len(offsets) < parts:
+            line = file.readline()
+            position = file.tell()
+            if not line or position >= size:
+                break
+            quotes += line.count(b'"')
+            target = start + (size - start) * len(offsets) / parts
+            if quotes % 2 == 0 and position >= target:
+                offsets.append(position)
+    return list(zip(offsets, offsets[1:] + [size]))
+
+
+def import_range(filename, path, start, end, chunk_size):
+    from .csv_import import SPECS_BY_FILENAME, CsvStream, import_rows
+
+    errors = []
+    with open(path, 'rb') as file:
+        stats = import_rows(
+            SPECS_BY_FILENAME[filename], CsvStream(file, start, end),
+            errors.append, chunk_size)
+    connections.close_all()
+    return stats, errors
+
+
+class ImportPipeline:
+
+    def __init__(self, specs, csv_path, workers, chunk_size, report_error,
+                 on_stage_done):
+        self.pending = {spec.filename: spec for spec in specs}
+        self.csv_path = csv_path
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.report_error = report_error
+        self.on_stage_done = on_stage_done
+        self.running = {}
+        self.remaining = {}
+        self.stage_stats = {}
+        self.failed = set()
+        self.done = set()
+
+    def is_ready(self, spec):
+        return all(
+            dependency in self.done
+            or dependency not in self.pending
+            and dependency not in self.remaining
+            for dependency in spec.depends_on
+        )
+
+    def tasks(self, spec):
+        path = os.path.join(self.csv_path, spec.filename)
+        parts = self.workers if spec.parallel else 1
+        return [
+            (import_range, spec.filename, path, start, end, self.chunk_size)
+            for start, end in split_ranges(path, parts)
+        ]
+
+    def submit_ready(self, executor):
+        from .csv_import import ImportStats
+
+        for spec in list(self.pending.values()):
+            if not self.is_ready(spec):
+                continue
+            del self.pending[spec.filename]
+            self.stage_stats[spec.filename] = ImportStats(spec.filename)
+            try:
+                tasks = self.tasks(spec)
+            except IOError as e:
+                self.failed.add(spec.filename)
+                self.report_error(
+                    f'Ошибка при открытии файла {spec.filename}: {e}')
+                tasks = []
+            self.remaining[spec.filename] = len(tasks)
+            for task in tasks:
+                self.running[executor.submit(*task)] = spec
+            if not tasks:
+                self.finish(spec)
+
+    def collect(self, future):
+        spec = self.running.pop(future)
+        try:
+            range_stats, errors = future.result()
+        except Exception as e:
+            self.report_error(
+                f'Ошибка при импорте файла {spec.filename}: {e}')
+        else:
+            self.stage_stats[spec.filename].add(range_stats)
+            for message in errors:
+                self.report_error(message)
+
+        self.remaining[spec.filename] -= 1
+        if not self.remaining[spec.filename]:
+            self.finish(spec)
+
+    def finish(self, spec):
+        del self.remaining[spec.filename]
+        self.done.add(spec.filename)
+        if spec.filename not in self.failed:
+            self.on_stage_done(
+                spec, self.stage_stats[spec.filename].finish())
+
+    def run(self):
+        connections.close_all()
+        with ProcessPoolExecutor(
+                self.workers, initializer=init_worker) as executor:
+            while self.pending or self.running:
+                self.submit_ready(executor)
+                finished, _ = wait(self.running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    self.collect(future)
+
+
+def run_pipeline(specs, csv_path, workers, chunk_size, report_error,
+                 on_stage_done):
+    ImportPipeline(
+        specs, csv_path, workers, chunk_size, report_error, on_stage_done
+    ).run()
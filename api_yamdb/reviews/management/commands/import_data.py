@@ -1,211 +1,117 @@
-import csv
 import os
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
-from django.utils.dateparse import parse_datetime
+from django.db import connection
 
-from reviews.models import Category, Genre, Title, User, Review, Comment
+from reviews.csv_import import (
+    CSV_SPECS, DEFAULT_CHUNK_SIZE, ImportCheckpoint, finish_import,
+    import_file, import_stream, reset_sequences
+)
+from reviews.csv_pipeline import run_pipeline
 
 
 class Command(BaseCommand):
+    help = 'Импортирует данные из CSV-файлов в базу данных'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', '--batch-size',
+            dest='chunk_size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Количество строк, записываемых в одной транзакции',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Количество процессов для параллельного импорта',
+        )
+        parser.add_argument(
+            '--stream',
+            action='store_true',
+            help='Потоковый импорт с сохранением прогресса после каждой '
+                 'записанной порции строк',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить потоковый импорт с места остановки',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл с прогрессом потокового импорта',
+        )
 
     def handle(self, *args, **options):
         csv_path = settings.CSV_DATA_PATH
-        self.import_categories(os.path.join(csv_path, 'category.csv'))
-        self.import_genres(os.path.join(csv_path, 'genre.csv'))
-        self.import_users(os.path.join(csv_path, 'users.csv'))
-        self.import_titles(os.path.join(csv_path, 'titles.csv'))
-        self.import_reviews(os.path.join(csv_path, 'review.csv'))
-        self.import_comments(os.path.join(csv_path, 'comments.csv'))
-        self.import_genre_titles(os.path.join(csv_path, 'genre_title.csv'))
-
-    def import_categories(self, filename):
-        try:
-            file = open(filename, encoding='utf-8')
-        except IOError as e:
-            self.stdout.write(self.style.ERROR(
-                f'Ошибка при открытии файла {filename}: {e}'))
-            return
-
-        with file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                try:
-                    Category.objects.update_or_create(
-                        id=row['id'],
-                        defaults={'name': row['name'], 'slug': row['slug']}
-                    )
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(
-                        f'Ошибка при обновлении категории {row["name"]}: {e}'))
-
-        self.stdout.write(self.style.SUCCESS('Импортирован category.csv'))
-
-    def import_genres(self, filename):
-        try:
-            file = open(filename, encoding='utf-8')
-        except IOError as e:
-            self.stdout.write(self.style.ERROR(
-                f'Ошибка при открытии файла {filename}: {e}'))
-            return
-
-        with file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                try:
-                    Genre.objects.update_or_create(
-                        id=row['id'],
-                        defaults={'name': row['name'], 'slug': row['slug']}
-                    )
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(
-                        f'Ошибка при обновлении жанра {row["name"]}: {e}'))
-
-        self.stdout.write(self.style.SUCCESS('Импортирован genre.csv'))
-
-    def import_titles(self, filename):
-        try:
-            file = open(filename, encoding='utf-8')
-        except IOError as e:
-            self.stdout.write(self.style.ERROR(
-                f'Ошибка при открытии файла {filename}: {e}'))
+        workers = options['workers']
+        if options['stream'] or options['resume']:
+            if workers > 1:
+                raise CommandError(
+                    'Потоковый импорт выполняется в одном процессе, '
+                    'параметр --workers с ним не используется')
+            self.import_streaming(csv_path, options)
             return
 
-        with file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                try:
-                    category = Category.objects.get(id=row['category'])
-                    Title.objects.update_or_create(
-                        id=row['id'],
-                        defaults={
-                            'name': row['name'],
-                            'category': category
-                        }
-                    )
-                except Category.DoesNotExist:
-                    self.stdout.write(self.style.ERROR(
-                        f'Категория не найдена: {row["category"]}'))
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(
-                        f'Ошибка при обновлении титула {row["name"]}: {e}'))
-
-        self.stdout.write(self.style.SUCCESS('Импортирован titles.csv'))
-
-    def import_users(self, filename):
-        try:
-            file = open(filename, encoding='utf-8')
-        except IOError as e:
-            self.stdout.write(self.style.ERROR(
-                f'Ошибка при открытии файла {filename}: {e}'))
-            return
-
-        with file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                try:
-                    User.objects.update_or_create(
-                        id=row['id'],
-                        defaults={
-                            'username': row['username'],
-                            'email': row['email'],
-                            'role': row['role'],
-                            'bio': row.get('bio', ''),
-                            'first_name': row.get('first_name', ''),
-                            'last_name': row.get('last_name', '')
-                        }
-                    )
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(
-                        'Ошибка при обновлении пользователя'
-                        f'{row["username"]}: {e}'))
-
-        self.stdout.write(self.style.SUCCESS('Импортирован users.csv'))
-
-    def import_reviews(self, filename):
-        try:
-            file = open(filename, encoding='utf-8')
-        except IOError as e:
-            self.stdout.write(self.style.ERROR(
-                f'Ошибка при открытии файла {filename}: {e}'))
-            return
-
-        with file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                try:
-                    title = Title.objects.get(id=row['title_id'])
-                    author = User.objects.get(id=row['author'])
-                    Review.objects.update_or_create(
-                        id=row['id'],
-                        defaults={
-                            'title': title,
-                            'text': row['text'],
-                            'author': author,
-                            'score': row['score'],
-                            'pub_date': parse_datetime(row['pub_date'])
-                        }
-                    )
-                except (Title.DoesNotExist, User.DoesNotExist) as e:
-                    self.stdout.write(self.style.ERROR(f'Ошибка: {e}'))
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(
-                        f'Ошибка при обновлении отзыва {row["id"]}: {e}'))
-
-        self.stdout.write(self.style.SUCCESS('Импортирован review.csv'))
-
-    def import_comments(self, filename):
-        try:
-            file = open(filename, encoding='utf-8')
-        except IOError as e:
-            self.stdout.write(self.style.ERROR(
-                f'Ошибка при открытии файла {filename}: {e}'))
-            return
-
-        with file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                try:
-                    review = Review.objects.get(id=row['review_id'])
-                    author = User.objects.get(id=row['author'])
-                    Comment.objects.update_or_create(
-                        id=row['id'],
-                        defaults={
-                            'review': review,
-                            'text': row['text'],
-                            'author': author,
-                            'pub_date': parse_datetime(row['pub_date'])
-                        }
-                    )
-                except (Review.DoesNotExist, User.DoesNotExist) as e:
-                    self.stdout.write(self.style.ERROR(f'Ошибка: {e}'))
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(
-                        f'Ошибка при обновлении комментария {row["id"]}: {e}'))
-
-        self.stdout.write(self.style.SUCCESS('Импортирован comments.csv'))
-
-    def import_genre_titles(self, filename):
+        if workers > 1 and connection.vendor == 'sqlite' and (
+                connection.is_in_memory_db()):
+            self.stdout.write(self.style.WARNING(
+                'База данных SQLite в памяти недоступна другим процессам, '
+                'импорт будет выполнен в одном процессе'))
+            workers = 1
+
+        if workers > 1:
+            run_pipeline(
+                CSV_SPECS, csv_path, workers, options['chunk_size'],
+                self.report_error, self.finish_stage)
+        else:
+            for spec in CSV_SPECS:
+                self.import_csv(
+                    spec, os.path.join(csv_path, spec.filename),
+                    options['chunk_size'])
+        reset_sequences([spec.model for spec in CSV_SPECS])
+
+    def import_streaming(self, csv_path, options):
+        checkpoint = ImportCheckpoint(
+            options['checkpoint']
+            or os.path.join(csv_path, '.import_checkpoint.json'))
+        if not options['resume']:
+            checkpoint.clear()
+
+        for spec in CSV_SPECS:
+            filename = os.path.join(csv_path, spec.filename)
+            try:
+                stats = import_stream(
+                    spec, filename, self.report_error, checkpoint,
+                    options['chunk_size'])
+            except IOError as e:
+                self.stdout.write(self.style.ERROR(
+                    f'Ошибка при открытии файла {filename}: {e}'))
+                continue
+            self.report_stats(spec, stats)
+        reset_sequences([spec.model for spec in CSV_SPECS])
+        checkpoint.clear()
+
+    def report_error(self, message):
+        self.stdout.write(self.style.ERROR(f'Ошибка: {message}'))
+
+    def import_csv(self, spec, filename, chunk_size):
         try:
-            file = open(filename, encoding='utf-8')
+            stats = import_file(spec, filename, self.report_error, chunk_size)
         except IOError as e:
             self.stdout.write(self.style.ERROR(
                 f'Ошибка при открытии файла {filename}: {e}'))
             return
+        self.report_stats(spec, stats)
 
-        with file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                try:
-                    title = Title.objects.get(id=row['title_id'])
-                    genre = Genre.objects.get(id=row['genre_id'])
-                    title.genres.add(genre)
-                except (Title.DoesNotExist, Genre.DoesNotExist) as e:
-                    self.stdout.write(self.style.ERROR(f'Ошибка: {e}'))
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(
-                        'Ошибка при добавлении жанра к титулу '
-                        f'{row["title_id"]}: {e}'))
+    def finish_stage(self, spec, stats):
+        finish_import(spec)
+        self.report_stats(spec, stats)
 
-        self.stdout.write(self.style.SUCCESS('Импортирован genre_titles.csv'))
+    def report_stats(self, spec, stats):
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортирован {spec.filename}: {stats.rows} строк '
+            f'за {stats.elapsed:.2f} с ({stats.rows_per_second:.0f} строк/с, '
+            f'ошибок: {stats.errors})'))
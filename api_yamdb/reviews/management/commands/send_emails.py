@@ -0,0 +1,55 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from reviews.outbox import claim_batch, deliver
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящей почты'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Количество потоков отправки',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Количество писем, забираемых из очереди за раз',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза в секундах, если очередь пуста',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить накопившиеся письма и завершить работу',
+        )
+
+    def handle(self, *args, **options):
+        with ThreadPoolExecutor(options['workers']) as executor:
+            while True:
+                emails = claim_batch(options['batch_size'])
+                if emails:
+                    sent = sum(executor.map(self.deliver, emails))
+                    self.stdout.write(self.style.SUCCESS(
+                        f'Отправлено писем: {sent} из {len(emails)}'))
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+
+    def deliver(self, email):
+        try:
+            return deliver(email)
+        finally:
+            connections.close_all()
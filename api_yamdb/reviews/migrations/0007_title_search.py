@@ -0,0 +1,47 @@
+from sqlite3 import sqlite_version_info
+
+from django.db import migrations
+
+SQLITE_TRIGRAM_VERSION = (3, 34, 0)
+
+
+def uses_fts(connection):
+    return (
+        connection.vendor == 'sqlite'
+        and sqlite_version_info >= SQLITE_TRIGRAM_VERSION
+    )
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if uses_fts(connection):
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS reviews_title_fts "
+            "USING fts5(name, tokenize='trigram')")
+        schema_editor.execute(
+            'INSERT INTO reviews_title_fts (rowid, name) '
+            'SELECT id, name FROM reviews_title')
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS title_name_trgm_idx '
+            'ON reviews_title USING gin (name gin_trgm_ops)')
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if uses_fts(connection):
+        schema_editor.execute('DROP TABLE IF EXISTS reviews_title_fts')
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS title_name_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def upper_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS title_name_trgm_idx')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS title_name_upper_trgm_idx '
+        'ON reviews_title USING gin (UPPER(name::text) gin_trgm_ops)')
+
+
+def plain_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS title_name_upper_trgm_idx')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS title_name_trgm_idx '
+        'ON reviews_title USING gin (name gin_trgm_ops)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_user_auth_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(upper_trigram_index, plain_trigram_index),
+    ]
@@ -3,9 +3,9 @@ from django.core.validators import (
     MaxValueValidator,
     RegexValidator
 )
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 from .constants import (
@@ -13,7 +13,8 @@ from .constants import (
     SLAG_LENGTH,
     ROLE_LENGTH,
     CODE_LENGTH,
-    USER_LENGTH
+    USER_LENGTH,
+    STATUS_LENGTH
 )
 
 
@@ -57,6 +58,10 @@ def validate_year(value):
 
 
 class Title(models.Model):
+    MAINTAINED_FIELDS = (
+        'rating_sum', 'rating_count', 'rating', 'version', 'modified'
+    )
+
     name = models.CharField(max_length=NAME_LENGTH, verbose_name='Название')
     year = models.IntegerField(
         validators=(validate_year,), verbose_name='Год выхода')
@@ -70,11 +75,38 @@ class Title(models.Model):
     )
     genre = models.ManyToManyField(
         Genre, related_name='titles', verbose_name='Жанр')
+    rating_sum = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Сумма оценок')
+    rating_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество оценок')
+    rating = models.PositiveSmallIntegerField(
+        null=True, editable=False, verbose_name='Рейтинг')
+    version = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Версия')
+    modified = models.DateTimeField(
+        default=timezone.now, editable=False, verbose_name='Дата изменения')
 
     class Meta:
         verbose_name = 'произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=('name',), name='title_name_idx'),
+            models.Index(
+                fields=('category', 'name'),
+                name='title_category_name_idx'
+            ),
+            models.Index(fields=('year', 'name'), name='title_year_name_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.MAINTAINED_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -85,6 +117,18 @@ def validate_username(value):
         raise ValidationError('Имя пользователя не может быть `me`.')
 
 
+class UserQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        if set(kwargs).intersection(self.model.AUTH_STATE_FIELDS):
+            kwargs.setdefault('auth_version', models.F('auth_version') + 1)
+        return super().update(**kwargs)
+
+
+class YamdbUserManager(UserManager.from_queryset(UserQuerySet)):
+    pass
+
+
 class User(AbstractUser):
     ADMIN = 'admin'
     MODERATOR = 'moderator'
@@ -131,10 +175,41 @@ class User(AbstractUser):
         },
     )
 
+    auth_version = models.PositiveIntegerField(
+        'Версия прав доступа',
+        default=0,
+        editable=False,
+    )
+
+    objects = YamdbUserManager()
+
+    AUTH_STATE_FIELDS = (
+        'username', 'role', 'is_superuser', 'is_staff', 'is_active')
+
     class Meta:
         verbose_name = 'пользователь'
         verbose_name_plural = 'Пользователи'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_auth_state = tuple(
+            instance.__dict__.get(field) for field in cls.AUTH_STATE_FIELDS)
+        return instance
+
+    def get_auth_state(self):
+        return tuple(getattr(self, field) for field in self.AUTH_STATE_FIELDS)
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, '_loaded_auth_state', None)
+        if not self._state.adding and loaded != self.get_auth_state():
+            self.auth_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'auth_version'}
+        super().save(*args, **kwargs)
+        self._loaded_auth_state = self.get_auth_state()
+
     @property
     def is_admin(self):
         return self.role == 'admin' or self.is_superuser
@@ -176,10 +251,27 @@ class Review(models.Model):
                 fields=('author', 'title'), name='author_title_unique'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            )
+        ]
         verbose_name = 'отзыв'
         verbose_name_plural = 'Отзывы'
         ordering = ('pub_date',)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        instance._loaded_title_id = instance.__dict__.get('title_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return f'{self.text} {self.title.name}'
 
@@ -205,6 +297,65 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('pub_date',)
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            )
+        ]
 
     def __str__(self):
         return self.text
+
+
+class OutgoingEmail(models.Model):
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (PENDING, 'Ожидает отправки'),
+        (SENDING, 'Отправляется'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    )
+    subject = models.CharField(max_length=NAME_LENGTH, verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(verbose_name='Отправитель')
+    to = models.TextField(verbose_name='Получатели')
+    status = models.CharField(
+        max_length=STATUS_LENGTH,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток отправки')
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Следующая попытка')
+    locked_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Взято в работу')
+    last_error = models.TextField(blank=True, verbose_name='Ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Дата создания')
+    sent_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Дата отправки')
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='outgoing_email_queue_idx'
+            )
+        ]
+
+    @property
+    def recipients(self):
+        return [address for address in self.to.split(',') if address]
+
+    def __str__(self):
+        return f'{self.subject} ({self.to})'
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+LOCK_TIMEOUT = timedelta(minutes=10)
+MAX_RETRY_DELAY = timedelta(hours=1)
+
+
+def queue_email(subject, body, from_email, recipients):
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email,
+        to=','.join(recipients),
+    )
+    if settings.EMAIL_OUTBOX_EAGER:
+        deliver(email)
+    return email
+
+
+def retry_delay(attempts):
+    delay = timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_DELAY) * (
+        2 ** (attempts - 1))
+    return min(delay, MAX_RETRY_DELAY)
+
+
+def deliver(email):
+    try:
+        send_mail(
+            email.subject,
+            email.body,
+            email.from_email,
+            email.recipients,
+        )
+    except Exception as e:
+        email.attempts += 1
+        email.last_error = str(e)
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = OutgoingEmail.FAILED
+        else:
+            email.status = OutgoingEmail.PENDING
+            email.next_attempt_at = timezone.now() + retry_delay(
+                email.attempts)
+    else:
+        email.attempts += 1
+        email.status = OutgoingEmail.SENT
+        email.sent_at = timezone.now()
+    email.locked_at = None
+    email.save(update_fields=(
+        'attempts', 'last_error', 'status', 'next_attempt_at', 'locked_at',
+        'sent_at',
+    ))
+    return email.status == OutgoingEmail.SENT
+
+
+def claim_batch(batch_size):
+    now = timezone.now()
+    candidates = OutgoingEmail.objects.filter(
+        Q(status=OutgoingEmail.PENDING, next_attempt_at__lte=now)
+        | Q(status=OutgoingEmail.SENDING, locked_at__lt=now - LOCK_TIMEOUT)
+    ).values_list('pk', 'status', 'locked_at')[:batch_size]
+
+    claimed = []
+    for pk, status, locked_at in candidates:
+        if OutgoingEmail.objects.filter(
+                pk=pk, status=status, locked_at=locked_at
+        ).update(status=OutgoingEmail.SENDING, locked_at=now):
+            claimed.append(pk)
+    return list(OutgoingEmail.objects.filter(pk__in=claimed))
@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.db.models import (
+    Case, Count, F, IntegerField, OuterRef, Subquery, Sum, When
+)
+from django.db.models.functions import Coalesce
+
+from .models import Review, Title
+from .versions import version_bump
+
+
+def apply_rating_delta(title_id, score_delta, count_delta):
+    rating_sum = F('rating_sum') + score_delta
+    rating_count = F('rating_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=Case(
+            When(rating_count=-count_delta, then=None),
+            default=rating_sum / rating_count,
+            output_field=IntegerField(),
+        ),
+        **version_bump(),
+    )
+
+
+def rebuild_ratings(titles=None):
+    if titles is None:
+        titles = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')).order_by().values('title')
+    with transaction.atomic():
+        updated = titles.update(
+            rating_sum=Coalesce(Subquery(
+                reviews.annotate(total=Sum('score')).values('total')), 0),
+            rating_count=Coalesce(Subquery(
+                reviews.annotate(total=Count('pk')).values('total')), 0),
+        )
+        titles.update(
+            rating=Case(
+                When(rating_count=0, then=None),
+                default=F('rating_sum') / F('rating_count'),
+                output_field=IntegerField(),
+            ),
+            **version_bump(),
+        )
+    return updated
@@ -0,0 +1,71 @@
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'reviews_title_fts'
+TRIGRAM_LENGTH = 3
+SQLITE_TRIGRAM_VERSION = (3, 34, 0)
+
+
+def uses_fts(db_connection=connection):
+    if db_connection.vendor != 'sqlite':
+        return False
+    from sqlite3 import sqlite_version_info
+    return sqlite_version_info >= SQLITE_TRIGRAM_VERSION
+
+
+def uses_trigram(db_connection=connection):
+    return db_connection.vendor == 'postgresql'
+
+
+def fts_phrase(query):
+    escaped = query.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def index_titles(titles):
+    if not uses_fts():
+        return
+    rows = [(title.pk, title.name) for title in titles]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT OR REPLACE INTO {FTS_TABLE} (rowid, name) '
+            f'VALUES (%s, %s)', rows)
+
+
+def unindex_title(title_id):
+    if not uses_fts():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [title_id])
+
+
+def rebuild_search_index(using=connection):
+    if not uses_fts(using):
+        return
+    with using.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name) '
+            f'SELECT id, name FROM reviews_title')
+
+
+def search_titles(queryset, query):
+    query = query.strip()
+    if len(query) < TRIGRAM_LENGTH or not (uses_fts() or uses_trigram()):
+        return queryset.filter(name__icontains=query)
+    if uses_trigram():
+        return queryset.filter(name__icontains=query).annotate(
+            search_rank=RawSQL(
+                'similarity(reviews_title.name, %s)', (query,))
+        ).order_by('-search_rank', 'name')
+
+    phrase = fts_phrase(query)
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        (phrase,)
+    )).annotate(search_rank=RawSQL(
+        f'SELECT rank FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND rowid = reviews_title.id',
+        (phrase,)
+    )).order_by('search_rank', 'name')
@@ -0,0 +1,103 @@
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
+from django.dispatch import receiver
+
+from .models import Category, Comment, Genre, Review, Title, User
+from .ratings import apply_rating_delta, rebuild_ratings
+from .search import index_titles, unindex_title
+from .versions import touch_titles
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    score = int(instance.score)
+    old_score = getattr(instance, '_loaded_score', None)
+    old_title_id = getattr(instance, '_loaded_title_id', None)
+
+    if created:
+        apply_rating_delta(instance.title_id, score, 1)
+    elif old_score is None or old_title_id is None:
+        rebuild_ratings(Title.objects.filter(pk=instance.title_id))
+    elif old_title_id != instance.title_id:
+        apply_rating_delta(old_title_id, -int(old_score), -1)
+        apply_rating_delta(instance.title_id, score, 1)
+    else:
+        apply_rating_delta(instance.title_id, score - int(old_score), 0)
+
+    instance._loaded_score = score
+    instance._loaded_title_id = instance.title_id
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    score = getattr(instance, '_loaded_score', None) or instance.score
+    apply_rating_delta(instance.title_id, -int(score), -1)
+
+
+@receiver(post_save, sender=Title)
+def touch_saved_title(sender, instance, raw, **kwargs):
+    if not raw:
+        touch_titles(Title.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Title)
+def index_saved_title(sender, instance, **kwargs):
+    index_titles([instance])
+
+
+@receiver(post_delete, sender=Title)
+def unindex_deleted_title(sender, instance, **kwargs):
+    unindex_title(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_commented_title(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_titles(Title.objects.filter(reviews=instance.review_id))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+def touch_titles_on_catalog_change(sender, instance, created, raw, **kwargs):
+    if not created and not raw:
+        touch_titles(instance.titles.all())
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Genre)
+def touch_titles_on_catalog_delete(sender, instance, **kwargs):
+    touch_titles(instance.titles.all())
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_titles_on_genre_change(sender, instance, action, reverse, pk_set,
+                                 **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        touch_titles(Title.objects.filter(pk=instance.pk))
+    elif action == 'pre_clear':
+        touch_titles(instance.titles.all())
+    else:
+        touch_titles(Title.objects.filter(pk__in=pk_set))
+
+
+def username_changed(user):
+    loaded = getattr(user, '_loaded_auth_state', None)
+    if loaded is None:
+        return True
+    return loaded[User.AUTH_STATE_FIELDS.index('username')] != user.username
+
+
+@receiver(post_save, sender=User)
+def touch_titles_on_author_change(sender, instance, created, raw, **kwargs):
+    if not created and not raw and username_changed(instance):
+        touch_titles(Title.objects.filter(
+            Q(reviews__author=instance)
+            | Q(reviews__comments__author=instance)
+        ))
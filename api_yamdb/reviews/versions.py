@@ -0,0 +1,13 @@
+from django.db.models import F
+from django.dispatch import Signal
+from django.utils import timezone
+
+catalog_imported = Signal()
+
+
+def version_bump():
+    return {'version': F('version') + 1, 'modified': timezone.now()}
+
+
+def touch_titles(titles):
+    return titles.update(**version_bump())
@@ -0,0 +1,12 @@
+from django.urls import include, path
+
+from api.async_views import AsyncReadRouter
+from api.urls import ASYNC_BASENAMES, router_v1
+
+router = AsyncReadRouter(async_basenames=ASYNC_BASENAMES)
+for prefix, viewset, basename in router_v1.registry:
+    router.register(prefix, viewset, basename=basename)
+
+urlpatterns = [
+    path('api/v1/', include(router.urls)),
+]
@@ -0,0 +1,125 @@
+import json
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, 'benchmarks', 'results.json')
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmarks')
+    group.addoption('--bench-titles', type=int, default=200,
+                    help='Количество произведений в синтетических данных.')
+    group.addoption('--bench-reviews', type=int, default=2000,
+                    help='Количество отзывов в синтетических данных.')
+    group.addoption('--bench-comments', type=int, default=2000,
+                    help='Количество комментариев в синтетических данных.')
+    group.addoption('--bench-repeat', type=int, default=20,
+                    help='Сколько раз выполнять каждый запрос.')
+    group.addoption('--bench-concurrency', type=int, default=20,
+                    help='Сколько одновременных запросов отправлять при '
+                         'сравнении синхронных и асинхронных представлений.')
+    group.addoption('--bench-output', default=DEFAULT_OUTPUT,
+                    help='Куда записать результаты в формате JSON.')
+    group.addoption('--bench-baseline', default=None,
+                    help='JSON с эталонными результатами для сравнения.')
+    group.addoption('--bench-tolerance', type=float, default=1.0,
+                    help='Допустимый относительный рост p95, например 0.5.')
+
+
+class BenchmarkReport:
+
+    def __init__(self, config):
+        self.scale = {
+            'titles': config.getoption('bench_titles'),
+            'reviews': config.getoption('bench_reviews'),
+            'comments': config.getoption('bench_comments'),
+        }
+        self.repeat = config.getoption('bench_repeat')
+        self.concurrency = config.getoption('bench_concurrency')
+        self.output = config.getoption('bench_output')
+        self.baseline = config.getoption('bench_baseline')
+        self.tolerance = config.getoption('bench_tolerance')
+        self.routes = {}
+        self.concurrent_routes = {}
+
+    def as_dict(self):
+        return {
+            'scale': self.scale,
+            'repeat': self.repeat,
+            'routes': self.routes,
+            'concurrency': self.concurrency,
+            'concurrent_routes': self.concurrent_routes,
+        }
+
+    def write(self):
+        with open(self.output, 'w', encoding='utf-8') as file:
+            json.dump(self.as_dict(), file, indent=2, sort_keys=True,
+                      ensure_ascii=False)
+            file.write('\n')
+
+    def compare(self, baseline):
+        same_scale = baseline.get('scale') == self.scale
+        regressions = []
+        for name, expected in sorted(baseline.get('routes', {}).items()):
+            actual = self.routes.get(name)
+            if actual is None:
+                continue
+            if actual['queries'] > expected['queries']:
+                regressions.append(
+                    f'{name}: запросов к БД {expected["queries"]} -> '
+                    f'{actual["queries"]}')
+            limit = expected['p95_ms'] * (1 + self.tolerance)
+            if same_scale and actual['p95_ms'] > limit:
+                regressions.append(
+                    f'{name}: p95 {expected["p95_ms"]} мс -> '
+                    f'{actual["p95_ms"]} мс')
+        return regressions
+
+
+def pytest_configure(config):
+    config.bench_report = BenchmarkReport(config)
+
+
+def pytest_sessionfinish(session):
+    report = session.config.bench_report
+    if not report.routes and not report.concurrent_routes:
+        return
+    report.write()
+    if not report.baseline:
+        return
+    with open(report.baseline, encoding='utf-8') as file:
+        regressions = report.compare(json.load(file))
+    reporter = session.config.pluginmanager.get_plugin('terminalreporter')
+    for message in regressions:
+        reporter.write_line(f'Регрессия: {message}', red=True)
+    if regressions:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+@pytest.fixture(scope='session')
+def bench_report(request):
+    return request.config.bench_report
+
+
+@pytest.fixture(scope='session')
+def dataset(django_db_setup, django_db_blocker, bench_report):
+    from benchmarks.dataset import seed
+
+    with django_db_blocker.unblock():
+        return seed(**bench_report.scale)
+
+
+@pytest.fixture
+def bench_client(dataset):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    client = APIClient()
+    token = AccessToken.for_user(dataset['admin'])
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from math import ceil
+
+from reviews.csv_import import keep_imported_dates
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.ratings import rebuild_ratings
+from reviews.search import rebuild_search_index
+
+BATCH_SIZE = 5000
+CATEGORIES = 10
+GENRES = 20
+GENRES_PER_TITLE = 2
+START_DATE = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def bulk_insert(model, objects, batch_size=BATCH_SIZE):
+    objects = iter(objects)
+    with keep_imported_dates(model):
+        while True:
+            batch = list(islice(objects, batch_size))
+            if not batch:
+                break
+            model.objects.bulk_create(batch)
+
+
+def seed(titles=200, reviews=2000, comments=2000):
+    reviews_per_title = max(1, ceil(reviews / titles))
+    users = max(reviews_per_title, 10)
+
+    bulk_insert(Category, (
+        Category(id=idx, name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(1, CATEGORIES + 1)
+    ))
+    bulk_insert(Genre, (
+        Genre(id=idx, name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(1, GENRES + 1)
+    ))
+    bulk_insert(User, (
+        User(
+            id=idx,
+            username=f'bench_user_{idx}',
+            email=f'bench_user_{idx}@yamdb.fake',
+            bio='Биография ' * 20,
+        )
+        for idx in range(1, users + 1)
+    ))
+    admin = User.objects.create_user(
+        username='bench_admin', email='bench_admin@yamdb.fake',
+        role=User.ADMIN)
+    bulk_insert(Title, (
+        Title(
+            id=idx,
+            name=f'Произведение {idx:06d}',
+            year=1950 + idx % 70,
+            description='Описание произведения. ' * 5,
+            category_id=idx % CATEGORIES + 1,
+        )
+        for idx in range(1, titles + 1)
+    ))
+    bulk_insert(Title.genre.through, (
+        Title.genre.through(
+            title_id=title_id,
+            genre_id=(title_id + offset) % GENRES + 1,
+        )
+        for title_id in range(1, titles + 1)
+        for offset in range(GENRES_PER_TITLE)
+    ))
+    bulk_insert(Review, (
+        Review(
+            id=idx + 1,
+            title_id=idx // reviews_per_title + 1,
+            author_id=idx % reviews_per_title + 1,
+            text=f'Текст отзыва {idx + 1}. ' * 10,
+            score=idx % 10 + 1,
+            pub_date=START_DATE + timedelta(minutes=idx),
+        )
+        for idx in range(reviews)
+    ))
+    hot_reviews = min(reviews, reviews_per_title)
+    bulk_insert(Comment, (
+        Comment(
+            id=idx + 1,
+            review_id=idx % hot_reviews + 1,
+            author_id=idx % users + 1,
+            text=f'Комментарий {idx + 1}',
+            pub_date=START_DATE + timedelta(minutes=idx),
+        )
+        for idx in range(comments)
+    ))
+    rebuild_ratings()
+    rebuild_search_index()
+
+    return {
+        'admin': admin,
+        'title_id': 1,
+        'review_id': 1,
+        'comment_id': 1,
+        'username': 'bench_user_1',
+    }
@@ -0,0 +1,96 @@
+import re
+import tracemalloc
+from math import ceil
+from time import perf_counter
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.urls import router_v1
+
+URL_KWARG = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+DETAIL_LOOKUPS = {
+    'titles': 'title_id',
+    'reviews': 'review_id',
+    'comments': 'comment_id',
+    'users': 'username',
+}
+
+
+def route_cases():
+    for prefix, viewset, basename in router_v1.registry:
+        yield f'{basename}-list', prefix, None
+        if hasattr(viewset, 'retrieve'):
+            yield f'{basename}-detail', prefix, DETAIL_LOOKUPS.get(basename)
+        for action in viewset.get_extra_actions():
+            if not action.detail and 'get' in action.mapping:
+                yield f'{basename}-{action.url_name}', prefix, action.url_path
+
+
+def build_url(prefix, suffix, dataset):
+    path = URL_KWARG.sub(lambda match: str(dataset[match.group(1)]), prefix)
+    url = f'/api/v1/{path}/'
+    if suffix in dataset:
+        return f'{url}{dataset[suffix]}/'
+    if suffix is not None:
+        return f'{url}{suffix}/'
+    return url
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[max(ceil(len(ordered) * percent / 100) - 1, 0)]
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+def measure(client, url, repeat):
+    timings = []
+    for _ in range(repeat):
+        clear_caches()
+        with CaptureQueriesContext(connection) as context:
+            started = perf_counter()
+            response = client.get(url)
+            timings.append((perf_counter() - started) * 1000)
+        queries = len(context.captured_queries)
+
+    clear_caches()
+    tracemalloc.start()
+    try:
+        client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return response, {
+        'url': url,
+        'status': response.status_code,
+        'queries': queries,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'peak_memory_kib': round(peak / 1024, 1),
+    }
+
+
+@pytest.mark.django_db
+class TestApiBenchmarks:
+
+    @pytest.mark.parametrize(
+        'name,prefix,suffix', list(route_cases()),
+        ids=[name for name, _, _ in route_cases()])
+    def test_route(self, name, prefix, suffix, dataset, bench_client,
+                   bench_report):
+        if suffix is None and name.endswith('-detail'):
+            pytest.fail(
+                f'Для маршрута `{name}` не задан объект в DETAIL_LOOKUPS.')
+        url = build_url(prefix, suffix, dataset)
+        response, result = measure(bench_client, url, bench_report.repeat)
+        assert response.status_code == 200, (
+            f'Запрос `{url}` вернул код {response.status_code}.'
+        )
+        bench_report.routes[name] = result
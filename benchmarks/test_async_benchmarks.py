@@ -0,0 +1,64 @@
+import asyncio
+from time import perf_counter
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from api.urls import ASYNC_BASENAMES
+from benchmarks.test_api_benchmarks import build_url, percentile, route_cases
+
+ASYNC_URLCONF = 'benchmarks.async_urls'
+READ_CASES = [
+    case for case in route_cases()
+    if case[0].rsplit('-', 1)[0] in ASYNC_BASENAMES
+]
+
+
+async def timed_get(client, url):
+    started = perf_counter()
+    response = await client.get(url)
+    return response.status_code, (perf_counter() - started) * 1000
+
+
+async def run_concurrently(url, concurrency):
+    client = AsyncClient()
+    started = perf_counter()
+    results = await asyncio.gather(*(
+        timed_get(client, url) for _ in range(concurrency)
+    ))
+    elapsed = (perf_counter() - started) * 1000
+    return results, elapsed
+
+
+def measure_concurrent(url, concurrency):
+    results, elapsed = async_to_sync(run_concurrently)(url, concurrency)
+    statuses = {status for status, _ in results}
+    timings = [timing for _, timing in results]
+    return statuses, {
+        'url': url,
+        'wall_ms': round(elapsed, 3),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+    }
+
+
+@pytest.mark.django_db
+class TestAsyncViewBenchmarks:
+
+    @pytest.mark.parametrize(
+        'name,prefix,suffix', READ_CASES,
+        ids=[name for name, _, _ in READ_CASES])
+    def test_route(self, name, prefix, suffix, dataset, bench_report,
+                   settings):
+        url = build_url(prefix, suffix, dataset)
+        results = {}
+        for mode, urlconf in (('sync', settings.ROOT_URLCONF),
+                              ('async', ASYNC_URLCONF)):
+            settings.ROOT_URLCONF = urlconf
+            statuses, results[mode] = measure_concurrent(
+                url, bench_report.concurrency)
+            assert statuses == {200}, (
+                f'Запросы `{url}` ({mode}) вернули коды {statuses}.'
+            )
+        bench_report.concurrent_routes[name] = results
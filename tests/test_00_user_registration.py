@@ -1,7 +1,9 @@
 from http import HTTPStatus
+from io import StringIO
 
 import pytest
 from django.core import mail
+from django.core.management import call_command
 from django.db.utils import IntegrityError
 
 from tests.utils import (
@@ -375,3 +377,59 @@ class Test00UserRegistration:
             'пользователя, созданного администратором,  возвращает ответ '
             'со статусом 200.'
         )
+
+    def test_signup_email_is_queued_for_worker(self, client, settings):
+        from reviews.models import OutgoingEmail
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        outbox_before_count = len(mail.outbox)
+        valid_data = {
+            'email': 'queued@yamdb.fake',
+            'username': 'queued_username'
+        }
+        response = client.post(self.URL_SIGNUP, data=valid_data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` не отправляет '
+            'письмо синхронно, а ставит его в очередь.'
+        )
+        email = OutgoingEmail.objects.get(to=valid_data['email'])
+        assert email.status == OutgoingEmail.PENDING
+
+        call_command('send_emails', '--once', stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `send_emails` отправляет письма из '
+            'очереди.'
+        )
+        assert valid_data['email'] in mail.outbox[-1].to
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.SENT
+
+    def test_queued_email_is_retried_with_backoff(self, monkeypatch,
+                                                  settings):
+        from django.utils import timezone
+        from reviews import outbox
+        from reviews.models import OutgoingEmail
+
+        def broken_send_mail(*args, **kwargs):
+            raise ConnectionError('SMTP недоступен')
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        monkeypatch.setattr(outbox, 'send_mail', broken_send_mail)
+        email = outbox.queue_email(
+            'Тема', 'Текст', 'noreply@yamdb.fake', ['retry@yamdb.fake']
+        )
+
+        call_command('send_emails', '--once', stdout=StringIO())
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.PENDING
+        assert email.attempts == 1
+        assert email.next_attempt_at > timezone.now()
+        assert 'SMTP' in email.last_error
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        call_command('send_emails', '--once', stdout=StringIO())
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.FAILED
+        assert email.attempts == 2
@@ -1,6 +1,8 @@
 from http import HTTPStatus
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from tests.utils import (
     check_name_and_slug_patterns, check_pagination, check_permissions,
@@ -153,3 +155,50 @@ class Test02CategoryAPI:
                           HTTPStatus.FORBIDDEN)
         check_permissions(moderator_client, self.CATEGORY_URL, data,
                           'модератора', categories, HTTPStatus.FORBIDDEN)
+
+    def test_06_category_search_prefix_index(self, client, admin_client):
+        create_categories(admin_client)
+        admin_client.post(
+            self.CATEGORY_URL,
+            data={'name': 'Научная литература', 'slug': 'science'}
+        )
+        client.get(f'{self.CATEGORY_URL}?search=кни')
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{self.CATEGORY_URL}?search=КНИ')
+        assert response.status_code == HTTPStatus.OK
+        assert [item['slug'] for item in response.json()['results']] == [
+            'books'
+        ], (
+            f'Проверьте, что `{self.CATEGORY_URL}?search=` ищет категории '
+            'по началу названия без учёта регистра.'
+        )
+        assert not context.captured_queries, (
+            'Повторный поиск категорий должен обслуживаться индексом в памяти '
+            'без запросов к БД.'
+        )
+
+        response = client.get(f'{self.CATEGORY_URL}?search=литер')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что поиск находит категорию по началу любого слова '
+            'в названии.'
+        )
+        response = client.get(f'{self.CATEGORY_URL}?search=ильм')
+        assert response.json()['count'] == 0
+
+        admin_client.post(
+            self.CATEGORY_URL, data={'name': 'Книжные серии', 'slug': 'series'}
+        )
+        response = client.get(f'{self.CATEGORY_URL}?search=кни')
+        assert response.json()['count'] == 2, (
+            'Проверьте, что индекс поиска категорий обновляется после '
+            'добавления категории.'
+        )
+        admin_client.delete(
+            self.CATEGORY_SLUG_TEMPLATE_URL.format(slug='books')
+        )
+        response = client.get(f'{self.CATEGORY_URL}?search=кни')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что индекс поиска категорий обновляется после '
+            'удаления категории.'
+        )
@@ -1,6 +1,8 @@
 from http import HTTPStatus
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from tests.utils import (
     check_pagination, check_permissions, create_categories, create_genre,
@@ -353,3 +355,241 @@ class Test04TitleAPI:
             f'Проверьте, что PUT-запрос к `{self.TITLES_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_07_titles_list_query_count(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+
+        def count_queries(url):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            return len(context.captured_queries), response.json()
+
+        single_title_url = f'{self.TITLES_URL}?year={titles[0]["year"]}'
+        single_count, data = count_queries(single_title_url)
+        assert len(data['results']) == 1
+
+        data = {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], genres[2]['slug']],
+            'category': categories[0]['slug'],
+            'description': 'In space no one can hear you scream.'
+        }
+        admin_client.post(self.TITLES_URL, data=data)
+        full_page_count, data = count_queries(self.TITLES_URL)
+        assert len(data['results']) == 3
+
+        assert full_page_count == single_count, (
+            'Проверьте, что количество SQL-запросов при GET-запросе к '
+            f'`{self.TITLES_URL}` не зависит от количества произведений на '
+            'странице: категории и жанры должны загружаться заранее.'
+        )
+
+        detail_count, _ = count_queries(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert detail_count <= 2, (
+            'Проверьте, что GET-запрос к '
+            f'`{self.TITLES_DETAIL_URL_TEMPLATE}` выполняет не более двух '
+            'SQL-запросов.'
+        )
+
+    def test_08_titles_list_cache(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert len(context.captured_queries) == 0, (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` '
+            'обслуживается из кэша без обращения к базе данных.'
+        )
+
+        update_data = {'name': 'Новое название'}
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data=update_data
+        )
+        response = client.get(self.TITLES_URL)
+        names = {title['name'] for title in response.json()['results']}
+        assert update_data['name'] in names, (
+            'Проверьте, что кэш списка произведений сбрасывается при '
+            'изменении произведения.'
+        )
+
+        user_client.post(
+            f'{self.TITLES_URL}{titles[1]["id"]}/reviews/',
+            data={'text': 'Отлично', 'score': 9}
+        )
+        response = client.get(self.TITLES_URL)
+        ratings = {
+            title['id']: title['rating']
+            for title in response.json()['results']
+        }
+        assert ratings[titles[1]['id']] == 9, (
+            'Проверьте, что кэш списка произведений сбрасывается при '
+            'добавлении отзыва.'
+        )
+
+    def test_09_titles_search(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        for name in ('Отец', 'Крестный отец'):
+            response = admin_client.post(self.TITLES_URL, data={
+                'name': name,
+                'year': 1972,
+                'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'],
+            })
+            assert response.status_code == HTTPStatus.CREATED
+
+        response = client.get(f'{self.TITLES_URL}?search=ОРЕШ')
+        assert response.status_code == HTTPStatus.OK
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Крепкий орешек'], (
+            f'Проверьте, что параметр `search` в `{self.TITLES_URL}` ищет '
+            'произведения по части названия без учёта регистра.'
+        )
+
+        response = client.get(f'{self.TITLES_URL}?search=отец')
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Отец', 'Крестный отец'], (
+            f'Проверьте, что результаты поиска в `{self.TITLES_URL}` '
+            'отсортированы по релевантности.'
+        )
+
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'name': 'Робокоп'}
+        )
+        admin_client.delete(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        )
+        response = client.get(f'{self.TITLES_URL}?search=робо')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        response = client.get(f'{self.TITLES_URL}?search=орешек')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что удалённое произведение исчезает из поиска.'
+        )
+
+        response = client.get(f'{self.TITLES_URL}?search=Ро')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что короткий поисковый запрос тоже обрабатывается.'
+        )
+
+    def test_10_titles_filter_by_several_genres(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        terminator, die_hard = titles
+
+        def names(query):
+            response = client.get(f'{self.TITLES_URL}?{query}')
+            assert response.status_code == HTTPStatus.OK
+            return sorted(
+                title['name'] for title in response.json()['results'])
+
+        assert names(f'genre={genres[0]["slug"]},{genres[1]["slug"]}') == [
+            terminator['name']
+        ], (
+            'Проверьте, что произведение с несколькими подходящими жанрами '
+            'попадает в выдачу один раз.'
+        )
+        assert names(f'genre={genres[0]["slug"]},{genres[2]["slug"]}') == (
+            sorted([terminator['name'], die_hard['name']])
+        ), (
+            'Проверьте, что по умолчанию жанры через запятую объединяются '
+            'по условию ИЛИ.'
+        )
+        assert names(
+            f'genre={genres[0]["slug"]},{genres[1]["slug"]}&genre_match=all'
+        ) == [terminator['name']]
+        assert names(
+            f'genre={genres[0]["slug"]},{genres[2]["slug"]}&genre_match=all'
+        ) == [], (
+            'Проверьте, что при `genre_match=all` произведение должно '
+            'относиться ко всем указанным жанрам.'
+        )
+        assert names('genre=unknown') == []
+        assert names(f'category={categories[1]["slug"]}') == [
+            die_hard['name']
+        ]
+
+        admin_client.post('/api/v1/genres/', data={
+            'name': 'Боевик', 'slug': 'action'
+        })
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=die_hard['id']),
+            data={'genre': ['action']}
+        )
+        assert names('genre=action') == [die_hard['name']], (
+            'Проверьте, что фильтр видит новые жанры сразу после создания.'
+        )
+
+    def test_11_titles_conditional_get(self, client, admin_client):
+        from reviews.csv_import import SPECS_BY_FILENAME, finish_import
+        from reviews.models import Title
+        from reviews.versions import version_bump
+
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        etag = response.get('ETag')
+        assert etag and response.get('Last-Modified'), (
+            f'Проверьте, что ответ на GET-запрос к `{self.TITLES_URL}` '
+            'содержит заголовки `ETag` и `Last-Modified`.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert len(context.captured_queries) == 0, (
+            f'Проверьте, что ответ 304 на GET-запрос к `{self.TITLES_URL}` '
+            'не требует запросов к базе данных.'
+        )
+
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'name': 'Новое название'}
+        )
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения произведения `ETag` списка '
+            'меняется.'
+        )
+
+        etag = response['ETag']
+        finish_import(SPECS_BY_FILENAME['titles.csv'])
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после импорта данных `ETag` списка меняется.'
+        )
+
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[1]['id'])
+        etag = client.get(detail_url)['ETag']
+        Title.objects.filter(pk=titles[1]['id']).update(
+            name='Изменено в другом процессе', **version_bump())
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == 'Изменено в другом процессе'
+        assert response['ETag'] != etag, (
+            'Проверьте, что `ETag` произведения берётся из БД и меняется '
+            'после изменения, сделанного другим процессом.'
+        )
+
+    def test_12_cache_version_bumps_after_commit(self):
+        from django.db import transaction
+
+        from api.cache import get_versions
+        from reviews.models import Category
+
+        before = get_versions([Category])
+        with transaction.atomic():
+            Category.objects.create(name='Мюзикл', slug='musical')
+            assert get_versions([Category]) == before, (
+                'Версия кэша не должна меняться до фиксации транзакции.'
+            )
+        assert get_versions([Category]) != before, (
+            'Версия кэша должна меняться после фиксации транзакции.'
+        )
@@ -1,11 +1,14 @@
 from http import HTTPStatus
 
 import pytest
+from django.db import connection
 from django.db.utils import IntegrityError
+from django.test.utils import CaptureQueriesContext
 
 from tests.utils import (
     check_fields, check_pagination, create_reviews, create_single_review,
-    create_titles
+    create_titles, user_queries_before_update, user_table_queries,
+    write_path_queries
 )
 
 
@@ -413,3 +416,286 @@ class Test05ReviewAPI:
             f'Проверьте, что PUT-запрос к `{self.REVIEW_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_07_review_rating_is_maintained(
+            self, admin_client, admin, user_client, user, moderator_client,
+            moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+
+        admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+            data={'score': 8}
+        )
+        response = admin_client.get(title_url)
+        assert response.json().get('rating') == 6, (
+            'Проверьте, что после изменения оценки отзыва рейтинг '
+            f'произведения в ответе на GET-запрос к `{title_url}` '
+            'пересчитывается.'
+        )
+
+        for review in reviews:
+            admin_client.delete(
+                self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id'], review_id=review['id']
+                )
+            )
+        response = admin_client.get(title_url)
+        assert response.json().get('rating') is None, (
+            'Проверьте, что после удаления всех отзывов рейтинг '
+            f'произведения в ответе на GET-запрос к `{title_url}` '
+            'равен `None`.'
+        )
+
+        from reviews.models import Title
+        from reviews.ratings import rebuild_ratings
+        Title.objects.update(rating_sum=100, rating_count=3, rating=33)
+        rebuild_ratings()
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            0, 0, None
+        ), (
+            'Проверьте, что `rebuild_ratings` пересчитывает рейтинг '
+            'произведения по существующим отзывам.'
+        )
+
+    def test_08_reviews_conditional_get(self, client, admin_client, admin,
+                                        user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag and response.get('Last-Modified'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным `ETag` в '
+            'заголовке `If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert len(context.captured_queries) == 1
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[1]['id']
+            ),
+            data={'text': 'Новый текст'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения отзыва `ETag` ответа на '
+            f'GET-запрос к `{url}` меняется.'
+        )
+        etag = response['ETag']
+
+        admin_client.post(
+            f'{url}{reviews[0]["id"]}/comments/', data={'text': 'Коммент'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления комментария `ETag` ответа на '
+            f'GET-запрос к `{url}` меняется.'
+        )
+        etag = response['ETag']
+
+        user.confirmation_code = 'новый код'
+        user.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что изменение полей автора, которые не выводятся в '
+            f'ответе, не меняет `ETag` ответа на GET-запрос к `{url}`.'
+        )
+
+        user.username = 'renamed_user'
+        user.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после смены имени автора `ETag` ответа на '
+            f'GET-запрос к `{url}` меняется.'
+        )
+
+    def test_09_reviews_cursor_pagination(self, client, admin_client, admin,
+                                          user_client, user,
+                                          moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{url}?pagination=cursor&page_size=2')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data and data['next'], (
+            f'Проверьте, что для эндпоинта `{url}` доступна курсорная '
+            'пагинация: `?pagination=cursor`.'
+        )
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ), (
+            f'Проверьте, что курсорная пагинация для `{url}` не выполняет '
+            'запрос на подсчёт количества отзывов.'
+        )
+        received = [review['id'] for review in data['results']]
+
+        response = client.get(data['next'])
+        assert response.status_code == HTTPStatus.OK
+        received += [review['id'] for review in response.json()['results']]
+        assert received == [review['id'] for review in reviews], (
+            f'Проверьте, что курсорная пагинация для `{url}` возвращает '
+            'отзывы по порядку публикации без пропусков и повторов.'
+        )
+
+    def test_10_review_author_check_skips_user_lookup(self, admin_client,
+                                                      admin, user_client,
+                                                      user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[1]['id']
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == HTTPStatus.OK
+        assert len(user_table_queries(context)) <= 1, (
+            'Проверка авторства отзыва не должна загружать автора '
+            'отдельным запросом.'
+        )
+        assert not user_queries_before_update(context, 'reviews_review'), (
+            'Проверка авторства отзыва должна сравнивать `author_id`, '
+            'не загружая автора до сохранения изменений.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not user_table_queries(context), (
+            'Удаление отзыва автором не должно загружать автора из БД.'
+        )
+
+    def test_11_review_post_queries(self, admin_client, admin, user_client,
+                                    user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'Отзыв', 'score': 8}
+        user_client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(write_path_queries(context)) <= 3, (
+            f'Проверьте, что POST-запрос к `{url}` проверяет произведение, '
+            'создаёт отзыв и обновляет рейтинг не более чем тремя запросами '
+            'к БД.'
+        )
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Повторный отзыв на то же произведение должен возвращать '
+            'ответ со статусом 400.'
+        )
+        response = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=0), data=data)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_12_reviews_list_reads_title_once(self, client, admin_client,
+                                              admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        title_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "reviews_title"' in query['sql']
+        ]
+        assert len(title_queries) == 1, (
+            f'Проверьте, что GET-запрос к `{url}` обращается к произведению '
+            'один раз: версия произведения для `ETag` одновременно '
+            'проверяет, что оно существует.'
+        )
+
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id']))
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == []
+        response = client.get(f'{url}?offset=100')
+        assert response.status_code == HTTPStatus.OK
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                self.REVIEWS_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что список отзывов несуществующего произведения '
+            'возвращает ответ со статусом 404.'
+        )
+        assert len(context.captured_queries) == 1, (
+            'Проверьте, что для несуществующего произведения список отзывов '
+            'не запрашивается.'
+        )
+
+    def test_13_reviews_page_is_one_query(self, client, admin_client, admin,
+                                          django_user_model):
+        from reviews.models import Review
+
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        authors = django_user_model.objects.bulk_create(
+            django_user_model(username=f'author{idx}',
+                              email=f'author{idx}@yamdb.fake')
+            for idx in range(100)
+        )
+        Review.objects.bulk_create(
+            Review(title_id=titles[1]['id'], author=author, text='Отзыв',
+                   score=5)
+            for author in django_user_model.objects.filter(
+                username__in=[author.username for author in authors])
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{url}?pagination=cursor&page_size=100')
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == 100
+        page_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "reviews_review"' in query['sql']
+            or '"reviews_user"' in query['sql']
+        ]
+        assert len(page_queries) == 1, (
+            f'Проверьте, что страница отзывов `{url}` загружается вместе с '
+            'авторами одним запросом.'
+        )
+        assert '"reviews_user"."password"' not in page_queries[0]
+        assert '"reviews_user"."bio"' not in page_queries[0]
+
+    def test_14_review_post_other_integrity_error(self, admin_client,
+                                                  user_client, monkeypatch):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        def broken_save(*args, **kwargs):
+            raise IntegrityError('NOT NULL constraint failed')
+
+        monkeypatch.setattr(Review, 'save', broken_save)
+        with pytest.raises(IntegrityError):
+            user_client.post(url, data={'text': 'Отзыв', 'score': 8})
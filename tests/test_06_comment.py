@@ -1,9 +1,13 @@
 from http import HTTPStatus
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from tests.utils import (check_fields, check_pagination, create_comments,
-                         create_reviews, create_single_comment)
+                         create_reviews, create_single_comment,
+                         user_queries_before_update, user_table_queries,
+                         write_path_queries)
 
 
 @pytest.mark.django_db(transaction=True)
@@ -366,3 +370,128 @@ class Test06CommentAPI:
             f'Проверьте, что PUT-запрос к `{self.COMMENT_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_08_comment_author_check_skips_user_lookup(
+            self, admin_client, admin, user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = self.COMMENT_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'],
+            review_id=reviews[0]['id'],
+            comment_id=comments[1]['id']
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(url, data={'text': 'Updated'})
+        assert response.status_code == HTTPStatus.OK
+        assert len(user_table_queries(context)) <= 1, (
+            'Проверка авторства комментария не должна загружать автора '
+            'отдельным запросом.'
+        )
+        assert not user_queries_before_update(context, 'reviews_comment'), (
+            'Проверка авторства комментария должна сравнивать `author_id`, '
+            'не загружая автора до сохранения изменений.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not user_table_queries(context), (
+            'Удаление комментария автором не должно загружать автора из БД.'
+        )
+
+    def test_09_comment_post_queries(self, admin_client, admin, user_client,
+                                     user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id'])
+        user_client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(write_path_queries(context)) <= 3, (
+            f'Проверьте, что POST-запрос к `{url}` проверяет отзыв, '
+            'создаёт комментарий и обновляет версию произведения не более '
+            'чем тремя запросами к БД.'
+        )
+
+        response = user_client.post(
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[1]['id'], review_id=reviews[0]['id']),
+            data={'text': 'Комментарий'}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_10_comments_list_reads_review_once(self, client, admin_client,
+                                                admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client})
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id'])
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        review_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "reviews_review"' in query['sql']
+        ]
+        assert len(review_queries) == 1, (
+            f'Проверьте, что GET-запрос к `{url}` обращается к отзыву один '
+            'раз: версия произведения для `ETag` одновременно проверяет, '
+            'что отзыв относится к произведению.'
+        )
+
+        response = client.get(f'{url}?page=1')
+        assert len(response.json()['results']) == len(comments)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[1]['id'], review_id=reviews[0]['id']))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что список комментариев к отзыву другого '
+            'произведения возвращает ответ со статусом 404.'
+        )
+        assert len(context.captured_queries) == 1, (
+            'Проверьте, что для несуществующего отзыва список комментариев '
+            'не запрашивается.'
+        )
+        response = client.get(self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_11_comments_page_is_one_query(self, client, admin_client, admin,
+                                           user_client, user,
+                                           moderator_client, moderator):
+        from reviews.models import Comment
+
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        _, reviews, titles = create_comments(admin_client, author_map)
+        Comment.objects.bulk_create(
+            Comment(review_id=reviews[1]['id'], author=author,
+                    text=f'Комментарий {idx}')
+            for idx in range(50)
+            for author in (admin, user)
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[1]['id'])
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{url}?pagination=cursor&page_size=100')
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == 100
+        page_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "reviews_comment"' in query['sql']
+            or '"reviews_user"' in query['sql']
+        ]
+        assert len(page_queries) == 1, (
+            f'Проверьте, что страница комментариев `{url}` загружается '
+            'вместе с авторами одним запросом.'
+        )
+        assert '"reviews_user"."password"' not in page_queries[0]
+        assert '"reviews_user"."bio"' not in page_queries[0]
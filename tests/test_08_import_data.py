@@ -0,0 +1,287 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from concurrent.futures import Future
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.conftest import MANAGE_PATH
+
+CSV_FILES = {
+    'category.csv': 'id,name,slug\n1,Фильм,movie\n2,Книга,book\n',
+    'genre.csv': 'id,name,slug\n1,Драма,drama\n2,Комедия,comedy\n',
+    'users.csv': (
+        'id,username,email,role,bio,first_name,last_name\n'
+        '100,bingobongo,bingobongo@yamdb.fake,user,,,\n'
+        '101,capt_obvious,capt_obvious@yamdb.fake,admin,,,\n'
+    ),
+    'titles.csv': (
+        'id,name,year,category\n'
+        '1,Побег из Шоушенка,1994,1\n'
+        '2,Крестный отец,1972,1\n'
+        '3,Потерянная книга,1990,999\n'
+    ),
+    'review.csv': (
+        'id,title_id,text,author,score,pub_date\n'
+        '1,1,"Ставлю десять звёзд!\nЛучший фильм.",100,10,'
+        '2019-09-24T21:08:21.567Z\n'
+        '2,1,Неплохо,101,5,2019-09-25T21:08:21.567Z\n'
+        '3,2,Отзыв без автора,555,5,2019-09-25T21:08:21.567Z\n'
+    ),
+    'comments.csv': (
+        'id,review_id,text,author,pub_date\n'
+        '1,1,Согласен,101,2020-01-13T23:20:02.422Z\n'
+    ),
+    'genre_title.csv': (
+        'id,title_id,genre_id\n'
+        '1,1,1\n2,2,1\n3,2,2\n4,2,2\n5,1,999\n6,999,1\n'
+    ),
+}
+
+
+IMPORT_SCRIPT = '''
+import sys
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+
+django.setup()
+settings.CSV_DATA_PATH = sys.argv[1]
+call_command('migrate', verbosity=0)
+call_command('import_data', '--workers', '2', '--chunk-size', '2')
+'''
+
+
+@pytest.fixture
+def csv_dir(tmp_path, settings):
+    for filename, content in CSV_FILES.items():
+        (tmp_path / filename).write_text(content, encoding='utf-8')
+    settings.CSV_DATA_PATH = str(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08ImportData:
+
+    def test_01_import_data(self, csv_dir):
+        from reviews.models import Comment, Review, Title, User
+
+        out = StringIO()
+        call_command('import_data', stdout=out)
+
+        assert User.objects.filter(id__in=(100, 101)).count() == 2
+        assert set(Title.objects.values_list('id', flat=True)) == {1, 2}, (
+            'Проверьте, что `import_data` пропускает произведения с '
+            'несуществующей категорией.'
+        )
+        assert set(Review.objects.values_list('id', flat=True)) == {1, 2}
+        assert Comment.objects.get(id=1).review_id == 1
+
+        review = Review.objects.get(id=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что `import_data` сохраняет дату публикации из CSV.'
+        )
+        assert review.text == 'Ставлю десять звёзд!\nЛучший фильм.'
+
+        title = Title.objects.get(id=1)
+        assert (title.year, title.rating, title.rating_count) == (
+            1994, 7, 2
+        ), (
+            'Проверьте, что после импорта отзывов пересчитывается рейтинг '
+            'произведений.'
+        )
+
+        links = set(
+            Title.genre.through.objects.values_list('title_id', 'genre_id')
+        )
+        assert links == {(1, 1), (2, 1), (2, 2)}, (
+            'Проверьте, что `import_data` связывает произведения с жанрами, '
+            'пропуская повторы и несуществующие произведения и жанры.'
+        )
+        assert 'genre_title.csv: 4 строк' in out.getvalue()
+        assert 'ошибок: 2' in out.getvalue()
+
+    def test_02_import_data_is_idempotent(self, csv_dir):
+        from reviews.models import Review, Title
+
+        call_command('import_data', stdout=StringIO())
+        (csv_dir / 'titles.csv').write_text(
+            'id,name,year,category\n1,Новое название,1994,2\n',
+            encoding='utf-8'
+        )
+        call_command('import_data', stdout=StringIO())
+
+        assert Title.objects.count() == 2
+        assert Review.objects.count() == 2
+        assert Title.genre.through.objects.count() == 3
+        title = Title.objects.get(id=1)
+        assert (title.name, title.category_id) == ('Новое название', 2), (
+            'Проверьте, что повторный импорт обновляет существующие записи.'
+        )
+        assert title.rating == 7
+
+    def test_03_import_data_dependencies(self):
+        from reviews.csv_import import CSV_SPECS
+        from reviews.csv_pipeline import ImportPipeline
+
+        imported = set()
+        for spec in CSV_SPECS:
+            assert set(spec.depends_on) <= imported, (
+                f'Проверьте, что `{spec.filename}` импортируется после '
+                'файлов, от которых он зависит.'
+            )
+            imported.add(spec.filename)
+
+        pipeline = ImportPipeline(CSV_SPECS, '', 2, 10, print, print)
+        ready = {
+            spec.filename for spec in CSV_SPECS if pipeline.is_ready(spec)
+        }
+        assert ready == {'category.csv', 'genre.csv', 'users.csv'}
+
+    def test_04_import_data_workers_fallback(self, csv_dir):
+        from reviews.models import Review
+
+        out = StringIO()
+        call_command('import_data', '--workers', '4', stdout=out)
+        assert 'в одном процессе' in out.getvalue()
+        assert Review.objects.count() == 2
+
+    def test_05_import_data_stream(self, csv_dir):
+        from reviews.models import Comment, Review, Title
+
+        call_command(
+            'import_data', '--stream', '--batch-size', '1', stdout=StringIO()
+        )
+        assert set(Review.objects.values_list('id', flat=True)) == {1, 2}
+        assert Comment.objects.count() == 1
+        assert Title.objects.get(id=1).rating == 7
+        assert not (csv_dir / '.import_checkpoint.json').exists(), (
+            'Проверьте, что после успешного импорта файл с прогрессом '
+            'удаляется.'
+        )
+
+    def test_06_import_data_resume(self, csv_dir):
+        from reviews.csv_import import CsvStream, ImportCheckpoint
+        from reviews.models import Review
+
+        call_command('import_data', stdout=StringIO())
+        Review.objects.all().delete()
+
+        review_path = csv_dir / 'review.csv'
+        with open(review_path, 'rb') as file:
+            stream = CsvStream(file)
+            first_row = next(iter(stream))
+            offset = stream.position
+        assert first_row['text'] == 'Ставлю десять звёзд!\nЛучший фильм.'
+
+        checkpoint = ImportCheckpoint(str(csv_dir / 'checkpoint.json'))
+        for filename in CSV_FILES:
+            size = (csv_dir / filename).stat().st_size
+            checkpoint.save(filename, size, size)
+        checkpoint.save(
+            'review.csv', offset, review_path.stat().st_size
+        )
+
+        call_command(
+            'import_data', '--resume',
+            '--checkpoint', str(csv_dir / 'checkpoint.json'),
+            stdout=StringIO()
+        )
+        assert list(Review.objects.values_list('id', flat=True)) == [2], (
+            'Проверьте, что `import_data --resume` продолжает импорт с '
+            'сохранённого смещения в файле.'
+        )
+
+    def test_07_import_data_workers(self, csv_dir, tmp_path):
+        db_path = tmp_path / 'import.sqlite3'
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'api_yamdb.settings',
+            'PYTHONPATH': MANAGE_PATH,
+            'SQLITE_PATH': str(db_path),
+        }
+        result = subprocess.run(
+            [sys.executable, '-c', IMPORT_SCRIPT, str(csv_dir)],
+            cwd=MANAGE_PATH, env=env, capture_output=True, text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, result.stderr
+        assert 'в одном процессе' not in result.stdout
+        assert 'genre_title.csv: 4 строк' in result.stdout, (
+            'Проверьте, что при импорте в несколько процессов каждая строка '
+            'файла обрабатывается один раз.'
+        )
+
+        with sqlite3.connect(db_path) as db:
+            reviews = db.execute(
+                'SELECT id FROM reviews_review ORDER BY id').fetchall()
+            links = db.execute(
+                'SELECT title_id, genre_id FROM reviews_title_genre'
+            ).fetchall()
+            rating = db.execute(
+                'SELECT rating FROM reviews_title WHERE id = 1').fetchone()
+        assert reviews == [(1,), (2,)]
+        assert set(links) == {(1, 1), (2, 1), (2, 2)}
+        assert rating == (7,), (
+            'Проверьте, что `import_data --workers` импортирует данные в '
+            'файловую базу SQLite из нескольких процессов.'
+        )
+
+    def test_08_import_data_worker_error_is_reported(self):
+        from reviews.csv_import import SPECS_BY_FILENAME, ImportStats
+        from reviews.csv_pipeline import ImportPipeline
+
+        spec = SPECS_BY_FILENAME['titles.csv']
+        errors, finished = [], []
+        pipeline = ImportPipeline(
+            [spec], '', 2, 10, errors.append,
+            lambda spec, stats: finished.append(spec))
+        future = Future()
+        future.set_exception(ValueError('сбой'))
+        pipeline.running[future] = spec
+        pipeline.remaining[spec.filename] = 1
+        pipeline.stage_stats[spec.filename] = ImportStats(spec.filename)
+
+        pipeline.collect(future)
+        assert errors == ['Ошибка при импорте файла titles.csv: сбой'], (
+            'Проверьте, что ошибки процессов импорта передаются в '
+            '`report_error`.'
+        )
+        assert finished == [spec], (
+            'Проверьте, что после ошибки одного из процессов рейтинги и '
+            'индексы пересчитываются по уже записанным строкам.'
+        )
+        assert spec.filename in pipeline.done
+
+    def test_09_import_data_split_ranges(self, tmp_path):
+        import csv
+
+        from reviews.csv_import import CsvStream
+        from reviews.csv_pipeline import split_ranges
+
+        path = tmp_path / 'review.csv'
+        path.write_text(
+            CSV_FILES['review.csv'] + ''.join(
+                f'{idx},1,"Строка {idx}\n""вторая""",100,5,'
+                '2019-09-24T21:08:21.567Z\n'
+                for idx in range(10, 40)
+            ),
+            encoding='utf-8'
+        )
+        with open(path, encoding='utf-8', newline='') as file:
+            expected = list(csv.DictReader(file))
+
+        ranges = split_ranges(str(path), 4)
+        assert len(ranges) == 4
+        rows = []
+        for start, end in ranges:
+            with open(path, 'rb') as file:
+                rows.extend(CsvStream(file, start, end))
+        assert rows == expected, (
+            'Проверьте, что файл делится на диапазоны по границам записей '
+            'и каждая строка попадает ровно в один диапазон.'
+        )
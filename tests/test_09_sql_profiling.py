@@ -0,0 +1,88 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+
+from api.profiling import fingerprint, query_stats
+from tests.utils import create_titles
+
+
+@pytest.fixture
+def profiling(settings):
+    settings.SQL_PROFILING_ENABLED = True
+    settings.SQL_PROFILING_SAMPLE_RATE = 1
+    settings.SQL_PROFILING_SLOW_QUERIES = 1000
+    settings.SQL_PROFILING_SLOW_DB_MS = 100000
+    query_stats.reset()
+    yield settings
+    query_stats.reset()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09SqlProfiling:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_fingerprint(self):
+        sql = (
+            "SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'It''s'"
+            "   AND year > 1984"
+        )
+        assert fingerprint(sql) == (
+            'SELECT * FROM t WHERE id IN (...) AND name = ? AND year > ?'
+        ), 'Отпечаток SQL должен скрывать литералы и списки значений.'
+
+    def test_02_counts_queries_by_view(self, admin_client, profiling):
+        create_titles(admin_client)
+        query_stats.reset()
+        admin_client.get(self.TITLES_URL)
+        admin_client.get(f'{self.TITLES_URL}?year=1984')
+
+        stats = query_stats.snapshot()
+        assert 'TitleViewSet.list' in stats, (
+            'Счётчики должны группироваться по классу и действию view.'
+        )
+        title_stats = stats['TitleViewSet.list']
+        assert title_stats['requests'] == 2
+        assert title_stats['queries'] > 0
+        assert title_stats['db_time'] > 0
+        assert title_stats['slow'] == 0
+
+    def test_03_logs_slow_requests(self, admin_client, profiling, caplog):
+        create_titles(admin_client)
+        profiling.SQL_PROFILING_SLOW_QUERIES = 1
+        with caplog.at_level(logging.WARNING, logger='api.profiling'):
+            admin_client.get(self.TITLES_URL)
+
+        assert query_stats.snapshot()['TitleViewSet.list']['slow'] == 1
+        messages = [record.getMessage() for record in caplog.records]
+        assert any(
+            'TitleViewSet.list' in message and 'SELECT' in message
+            for message in messages
+        ), 'Медленный запрос должен попадать в лог с отпечатками SQL.'
+
+    def test_04_not_sampled(self, admin_client, profiling):
+        profiling.SQL_PROFILING_SAMPLE_RATE = 0
+        admin_client.get(self.TITLES_URL)
+        assert query_stats.snapshot() == {}, (
+            'Запросы, не попавшие в выборку, не должны учитываться.'
+        )
+
+    def test_05_counters_published_in_metrics(self, client, admin_client,
+                                              profiling):
+        create_titles(admin_client)
+        query_stats.reset()
+        client.get(self.TITLES_URL)
+        client.get(self.TITLES_URL)
+
+        response = client.get('/metrics')
+        assert response.status_code == HTTPStatus.OK
+        content = response.content.decode()
+        assert (
+            'api_sql_profile_requests_total{view="TitleViewSet.list"} 2.0'
+            in content
+        ), (
+            'Счётчики профилировщика SQL должны публиковаться в `/metrics`.'
+        )
+        assert 'api_sql_profile_queries_total{view="TitleViewSet.list"}' in (
+            content)
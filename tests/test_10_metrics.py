@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+from prometheus_client import REGISTRY
+
+from tests.utils import create_titles
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10Metrics:
+
+    METRICS_URL = '/metrics'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_metrics_endpoint(self, client):
+        response = client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.METRICS_URL}` должен быть доступен.'
+        )
+        assert b'api_requests_total' in response.content
+
+    def test_02_request_metrics(self, client, admin_client):
+        create_titles(admin_client)
+        route = 'TitleViewSet.list'
+        requests_before = sample(
+            'api_requests_total', route=route, method='GET', status='200')
+        latency_before = sample(
+            'api_request_duration_seconds_count', route=route, method='GET')
+        queries_before = sample('api_db_queries_sum', route=route)
+        serializer_before = sample(
+            'api_serializer_duration_seconds_count', route=route)
+        size_before = sample('api_response_size_bytes_sum', route=route)
+
+        response = client.get(self.TITLES_URL)
+
+        assert sample(
+            'api_requests_total', route=route, method='GET', status='200'
+        ) == requests_before + 1, (
+            'Каждый запрос должен учитываться в `api_requests_total`.'
+        )
+        assert sample(
+            'api_request_duration_seconds_count', route=route, method='GET'
+        ) == latency_before + 1
+        assert sample('api_db_queries_sum', route=route) > queries_before, (
+            'Запросы к БД должны учитываться в `api_db_queries`.'
+        )
+        assert sample(
+            'api_serializer_duration_seconds_count', route=route
+        ) == serializer_before + 1
+        assert sample(
+            'api_response_size_bytes_sum', route=route
+        ) == size_before + len(response.content)
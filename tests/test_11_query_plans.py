@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+def query_plans(client, url, table):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'GET-запрос к `{url}` должен вернуть ответ со статусом 200.'
+    )
+    plans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT') or f'FROM "{table}"' not in sql:
+                continue
+            if 'ORDER BY' not in sql:
+                continue
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plans.append(' '.join(row[-1] for row in cursor.fetchall()))
+    assert plans, f'Не найден запрос к таблице `{table}` для `{url}`.'
+    return plans
+
+
+def assert_uses_index(client, url, table, index):
+    plans = query_plans(client, url, table)
+    assert any(index in plan for plan in plans), (
+        f'Запрос списка `{url}` должен использовать индекс `{index}`, '
+        f'план: {plans}'
+    )
+    assert not any('TEMP B-TREE' in plan for plan in plans), (
+        f'Запрос списка `{url}` не должен сортировать строки отдельно, '
+        f'план: {plans}'
+    )
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Планы запросов проверяются в SQLite'
+)
+@pytest.mark.django_db(transaction=True)
+class Test11QueryPlans:
+
+    def test_01_titles_list(self, client, admin_client):
+        create_titles(admin_client)
+        assert_uses_index(
+            client, '/api/v1/titles/', 'reviews_title', 'title_name_idx')
+        assert_uses_index(
+            client, '/api/v1/titles/?year=1984', 'reviews_title',
+            'title_year_name_idx')
+
+    def test_02_titles_by_category(self, client, admin_client):
+        _, categories, _ = create_titles(admin_client)
+        assert_uses_index(
+            client, f'/api/v1/titles/?category={categories[0]["slug"]}',
+            'reviews_title', 'title_category_name_idx')
+
+    def test_03_reviews_and_comments(self, client, admin_client, admin,
+                                     user_client, user, moderator_client,
+                                     moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        assert_uses_index(
+            client, f'/api/v1/titles/{title_id}/reviews/', 'reviews_review',
+            'review_title_pub_date_idx')
+        assert_uses_index(
+            client,
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            'reviews_comment', 'comment_review_pub_date_idx')
@@ -0,0 +1,195 @@
+import sqlite3
+
+import pytest
+from django.db import connection
+from django.db.utils import OperationalError
+
+from api_yamdb.db.pool import ConnectionPool
+from api_yamdb.db.sqlite3.base import DatabaseWrapper
+
+
+def sqlite_connect():
+    return sqlite3.connect(':memory:', check_same_thread=False)
+
+
+class Test12Database:
+
+    @pytest.mark.django_db
+    def test_01_sqlite_pragmas(self, tmp_path):
+        settings_dict = dict(connection.settings_dict)
+        settings_dict['NAME'] = str(tmp_path / 'pragmas.sqlite3')
+        wrapper = DatabaseWrapper(settings_dict, alias='pragmas')
+        try:
+            with wrapper.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                assert cursor.fetchone()[0] == 'wal', (
+                    'SQLite должна работать в режиме WAL.'
+                )
+                cursor.execute('PRAGMA synchronous')
+                assert cursor.fetchone()[0] == 1, (
+                    'Для SQLite должен быть задан `synchronous=NORMAL`.'
+                )
+                cursor.execute('PRAGMA mmap_size')
+                assert cursor.fetchone()[0] > 0
+        finally:
+            wrapper.close()
+
+    def test_02_pool_reuses_connections(self):
+        pool = ConnectionPool(sqlite_connect, max_size=2)
+        first = pool.acquire()
+        pool.release(first)
+        assert pool.acquire() is first, (
+            'Пул должен повторно выдавать возвращённое соединение.'
+        )
+
+    def test_03_pool_max_size(self):
+        pool = ConnectionPool(sqlite_connect, max_size=2, timeout=0.01)
+        connections = [pool.acquire(), pool.acquire()]
+        with pytest.raises(OperationalError):
+            pool.acquire()
+        pool.release(connections[0])
+        assert pool.acquire() is connections[0]
+
+    def test_04_pool_health_check(self):
+        pool = ConnectionPool(sqlite_connect, max_size=1, check_idle=0)
+        broken = pool.acquire()
+        pool.release(broken)
+        broken.close()
+        healthy = pool.acquire()
+        assert healthy is not broken, (
+            'Пул не должен выдавать соединение, не прошедшее проверку.'
+        )
+        healthy.execute('SELECT 1')
+
+    def test_05_pool_discards_unusable(self):
+        pool = ConnectionPool(
+            sqlite_connect, max_size=1, reset=lambda connection: False)
+        first = pool.acquire()
+        pool.release(first)
+        assert pool.acquire() is not first
+
+    def test_06_pool_close_discards_released(self):
+        pool = ConnectionPool(sqlite_connect, max_size=2)
+        idle, busy = pool.acquire(), pool.acquire()
+        pool.release(idle)
+        pool.close()
+        pool.release(busy)
+        assert pool.idle.empty(), (
+            'Закрытый пул должен закрывать возвращаемые соединения.'
+        )
+        with pytest.raises(sqlite3.ProgrammingError):
+            busy.execute('SELECT 1')
+        with pytest.raises(sqlite3.ProgrammingError):
+            idle.execute('SELECT 1')
+
+
+class FakePgConnection:
+    isolation_level = 1
+
+    def __init__(self, params):
+        from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+        self.params = params
+        self.closed = False
+        self.status = TRANSACTION_STATUS_IDLE
+        self.rolled_back = False
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+        self.rolled_back = True
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pg_base(monkeypatch):
+    pytest.importorskip('psycopg2')
+    from api_yamdb.db.postgresql import base
+
+    monkeypatch.setattr(
+        base, 'connect',
+        lambda conn_params, options: FakePgConnection(conn_params))
+    yield base
+    base.close_pool('pg_test')
+
+
+def pg_wrapper(base):
+    return base.DatabaseWrapper({
+        'ENGINE': 'api_yamdb.db.postgresql',
+        'NAME': 'api_yamdb',
+        'OPTIONS': {},
+        'POOL': {'MAX_SIZE': 2, 'TIMEOUT': 0.01},
+    }, alias='pg_test')
+
+
+class Test12PostgresqlPool:
+
+    def test_01_close_returns_connection_to_pool(self, pg_base):
+        wrapper = pg_wrapper(pg_base)
+        first = wrapper.get_new_connection({'database': 'api_yamdb'})
+        wrapper.connection = first
+        wrapper._close()
+        assert not first.closed, (
+            'Закрытие соединения Django должно возвращать его в пул.'
+        )
+        assert wrapper.get_new_connection({'database': 'api_yamdb'}) is (
+            first)
+
+    def test_02_pool_rebuilt_when_params_change(self, pg_base):
+        wrapper = pg_wrapper(pg_base)
+        idle = wrapper.get_new_connection({'database': 'api_yamdb'})
+        busy = wrapper.get_new_connection({'database': 'api_yamdb'})
+        wrapper.connection = idle
+        wrapper._close()
+        wrapper.connection = busy
+
+        other = pg_wrapper(pg_base)
+        test_db = other.get_new_connection({'database': 'test_api_yamdb'})
+        assert test_db.params == {'database': 'test_api_yamdb'}, (
+            'После смены параметров подключения пул должен выдавать '
+            'соединения с новой БД.'
+        )
+        assert idle.closed, (
+            'Свободные соединения со старой БД должны закрываться.'
+        )
+        wrapper._close()
+        assert busy.closed, (
+            'Соединение со старой БД должно закрываться при возврате.'
+        )
+
+    def test_03_reset_rolls_back_open_transaction(self, pg_base):
+        from psycopg2.extensions import TRANSACTION_STATUS_INTRANS
+
+        connection = FakePgConnection({})
+        connection.status = TRANSACTION_STATUS_INTRANS
+        assert pg_base.reset(connection) is True
+        assert connection.rolled_back, (
+            'Соединение с незавершённой транзакцией должно откатываться '
+            'перед возвратом в пул.'
+        )
+
+        connection.closed = True
+        assert pg_base.reset(connection) is False
+
+    def test_04_destroy_test_db_closes_pool(self, pg_base, monkeypatch):
+        from django.db.backends.postgresql import creation
+
+        wrapper = pg_wrapper(pg_base)
+        idle = wrapper.get_new_connection({'database': 'test_api_yamdb'})
+        wrapper.connection = idle
+        wrapper._close()
+        monkeypatch.setattr(
+            creation.DatabaseCreation, '_destroy_test_db',
+            lambda self, name, verbosity: None)
+
+        wrapper.creation._destroy_test_db('test_api_yamdb', 0)
+        assert idle.closed, (
+            'Перед удалением тестовой БД пул должен закрыть соединения '
+            'с ней.'
+        )
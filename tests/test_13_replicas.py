@@ -0,0 +1,130 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connections
+
+from api_yamdb.db import replicas
+from reviews.models import Category
+
+REPLICA_ALIAS = 'replica_test'
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    connections.databases[REPLICA_ALIAS] = {
+        **connections.databases['default'],
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+        'TEST': {},
+    }
+    call_command('migrate', database=REPLICA_ALIAS, verbosity=0)
+    Category.objects.using(REPLICA_ALIAS).create(
+        name='Только в реплике', slug='replica-only')
+    settings.DATABASE_REPLICAS = [REPLICA_ALIAS]
+    replicas.lag_checks.clear()
+    yield REPLICA_ALIAS
+    replicas.lag_checks.clear()
+    connections[REPLICA_ALIAS].close()
+    del connections[REPLICA_ALIAS]
+    del connections.databases[REPLICA_ALIAS]
+
+
+def category_slugs(client):
+    response = client.get('/api/v1/categories/')
+    assert response.status_code == HTTPStatus.OK
+    return {category['slug'] for category in response.json()['results']}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Replicas:
+
+    def test_01_reads_go_to_replica(self, client, replica):
+        assert category_slugs(client) == {'replica-only'}, (
+            'GET-запросы должны читать данные из реплики.'
+        )
+
+    def test_02_writer_is_pinned_to_primary(self, client, admin_client,
+                                            replica):
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Книги', 'slug': 'books'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert category_slugs(client) == {'replica-only'}, (
+            'Другие клиенты должны продолжать читать из реплики.'
+        )
+        assert category_slugs(admin_client) == {'books'}, (
+            'После записи клиент должен читать данные из основной БД, '
+            'минуя кэш ответов.'
+        )
+
+    def test_03_lagging_replica_is_skipped(self, client, replica,
+                                           monkeypatch):
+        monkeypatch.setattr(replicas, 'measure_lag', lambda alias: 60)
+        Category.objects.create(name='Книги', slug='books')
+        assert category_slugs(client) == {'books'}, (
+            'При отставании реплики чтение должно идти в основную БД.'
+        )
+
+    def test_04_round_robin(self, settings, replica):
+        settings.DATABASE_REPLICAS = [REPLICA_ALIAS, 'default']
+        chosen = {replicas.choose_replica() for _ in range(4)}
+        assert chosen == {REPLICA_ALIAS, 'default'}, (
+            'Чтение должно распределяться между репликами по очереди.'
+        )
+
+    def test_05_header_client_pinned_across_workers(self, settings,
+                                                    admin_client, replica):
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Книги', 'slug': 'books'})
+        assert response.status_code == HTTPStatus.CREATED
+        admin_client.cookies.clear()
+
+        other_worker_cache = caches.create_connection(
+            settings.REPLICA_PIN_CACHE)
+        key = replicas.pin_key(response.wsgi_request)
+        assert other_worker_cache.get(key) is not None, (
+            'Отметка о записи должна храниться в общем для процессов '
+            'хранилище.'
+        )
+        assert category_slugs(admin_client) == {'books'}, (
+            'Клиент без cookie должен читать из основной БД после записи.'
+        )
+
+    def test_06_replica_reads_cached_within_lag(self, settings, client,
+                                                replica):
+        settings.REPLICA_MAX_LAG = 0
+        assert category_slugs(client) == {'replica-only'}
+        Category.objects.using(replica).bulk_create([
+            Category(name='Новая в реплике', slug='replica-new')])
+        assert category_slugs(client) == {'replica-only', 'replica-new'}, (
+            'Ответы, прочитанные из реплики, не должны кэшироваться '
+            'дольше допустимого отставания реплики.'
+        )
+
+    def test_07_replica_is_chosen_once_per_request(self, rf, settings,
+                                                   monkeypatch):
+        from django.http import HttpResponse
+
+        from reviews.models import Title
+
+        settings.DATABASE_REPLICAS = ['replica_a', 'replica_b']
+        monkeypatch.setattr(replicas, 'measure_lag', lambda alias: 0)
+        middleware = replicas.ReplicaRoutingMiddleware(lambda request: None)
+        router = replicas.ReplicaRouter()
+
+        chosen = set()
+        for _ in range(2):
+            request = rf.get('/api/v1/titles/')
+            middleware.process_request(request)
+            aliases = {
+                router.db_for_read(model)
+                for model in (Title, Category, Title.genre.through)
+            }
+            middleware.process_response(request, HttpResponse())
+            assert len(aliases) == 1, (
+                'Все запросы на чтение в рамках одного HTTP-запроса должны '
+                'идти в одну реплику.'
+            )
+            chosen |= aliases
+        replicas.lag_checks.clear()
+        assert chosen == {'replica_a', 'replica_b'}
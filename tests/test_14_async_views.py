@@ -0,0 +1,68 @@
+import asyncio
+import time
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory
+
+from api.async_views import AsyncReadRouter, async_view
+from api.views import TitleViewSet, UserViewSet
+from tests.utils import create_titles
+
+SLOW_VIEW_SECONDS = 0.2
+CONCURRENT_REQUESTS = 5
+
+
+def slow_view(request):
+    time.sleep(SLOW_VIEW_SECONDS)
+    return HttpResponse()
+
+
+async def run_concurrently(view):
+    request = AsyncRequestFactory().get('/slow/')
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        view(request) for _ in range(CONCURRENT_REQUESTS)
+    ))
+    return time.perf_counter() - started
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14AsyncViews:
+
+    def test_01_async_title_list(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        view = async_view(TitleViewSet.as_view({'get': 'list'}))
+        assert asyncio.iscoroutinefunction(view)
+
+        request = AsyncRequestFactory().get('/api/v1/titles/')
+        response = async_to_sync(view)(request)
+        assert response.status_code == HTTPStatus.OK
+        assert response.data['count'] == len(titles), (
+            'Асинхронное представление должно возвращать те же данные, '
+            'что и синхронное.'
+        )
+
+    def test_02_reads_are_multiplexed(self):
+        async_elapsed = async_to_sync(run_concurrently)(async_view(slow_view))
+        sync_elapsed = async_to_sync(run_concurrently)(
+            sync_to_async(slow_view))
+        assert sync_elapsed >= SLOW_VIEW_SECONDS * CONCURRENT_REQUESTS
+        assert async_elapsed < SLOW_VIEW_SECONDS * CONCURRENT_REQUESTS / 2, (
+            'Медленные GET-запросы к асинхронным представлениям должны '
+            'обрабатываться параллельно.'
+        )
+
+    def test_03_router_wraps_selected_routes(self):
+        router = AsyncReadRouter(async_basenames=('titles',))
+        router.register('titles', TitleViewSet, basename='titles')
+        router.register('users', UserViewSet, basename='users')
+        callbacks = {
+            url.name: url.callback for url in router.urls
+            if getattr(url, 'name', None)
+        }
+        assert asyncio.iscoroutinefunction(callbacks['titles-list'])
+        assert asyncio.iscoroutinefunction(callbacks['titles-detail'])
+        assert not asyncio.iscoroutinefunction(callbacks['users-list'])
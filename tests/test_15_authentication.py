@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import (
+    ClaimsJWTAuthentication, access_token_for, user_states
+)
+from tests.utils import user_table_queries
+
+
+def token_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {access_token_for(user)}')
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Authentication:
+
+    def setup_method(self):
+        user_states.clear()
+
+    def test_01_token_carries_role_claims(self, client, moderator):
+        moderator.confirmation_code = 'code'
+        moderator.save()
+        response = client.post('/api/v1/auth/token/', data={
+            'username': moderator.username, 'confirmation_code': 'code'})
+        assert response.status_code == HTTPStatus.OK
+
+        token = AccessToken(response.json()['token'])
+        assert token['role'] == 'moderator'
+        assert token['is_superuser'] is False
+        assert 'auth_version' in token, (
+            'Токен должен содержать роль пользователя и версию его данных.'
+        )
+
+    def test_02_authenticated_reads_skip_user_lookup(self, admin):
+        client = token_client(admin)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/categories/')
+        assert response.status_code == HTTPStatus.OK
+        assert not user_table_queries(context), (
+            'Аутентификация по токену с ролью не должна загружать '
+            'пользователя из БД.'
+        )
+
+    def test_03_legacy_token_is_loaded_once(self, admin, admin_client):
+        with CaptureQueriesContext(connection) as context:
+            admin_client.get('/api/v1/categories/')
+        assert len(user_table_queries(context)) == 1
+
+        with CaptureQueriesContext(connection) as context:
+            admin_client.get('/api/v1/categories/')
+        assert not user_table_queries(context), (
+            'Состояние пользователя должно кэшироваться в процессе.'
+        )
+
+    def test_04_role_change_invalidates_token_claims(self, admin):
+        client = token_client(admin)
+        assert client.get('/api/v1/users/').status_code == HTTPStatus.OK
+
+        admin.role = 'user'
+        admin.save()
+        response = client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'После смены роли права из старого токена не должны '
+            'применяться.'
+        )
+
+    def test_05_deactivated_user_is_rejected(self, user):
+        client = token_client(user)
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+
+        user.is_active = False
+        user.save()
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_06_deleted_user_is_rejected(self, user):
+        client = token_client(user)
+        user.delete()
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_07_bulk_update_expires_with_ttl(self, admin, settings):
+        settings.AUTH_USER_STATE_TTL = 0
+        client = token_client(admin)
+        assert client.get('/api/v1/users/').status_code == HTTPStatus.OK
+
+        admin.__class__.objects.filter(pk=admin.pk).update(role='user')
+        admin.refresh_from_db()
+        assert admin.auth_version == 1, (
+            'Массовое изменение роли должно увеличивать версию прав доступа.'
+        )
+        response = client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Права из токена должны перепроверяться по БД после истечения '
+            'срока жизни кэша.'
+        )
+
+    def test_08_token_user_save_keeps_profile(self, admin):
+        token = AccessToken(str(access_token_for(admin)))
+        user = ClaimsJWTAuthentication().get_user(token)
+        user.save()
+
+        admin.refresh_from_db()
+        assert admin.email == 'testadmin@yamdb.fake'
+        assert admin.bio == 'admin bio', (
+            'Сохранение пользователя из токена не должно затирать поля, '
+            'которых нет в токене.'
+        )
+
+    def test_09_me_reuses_loaded_user(self, user, user_client):
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['bio'] == 'user bio'
+        assert len(context.captured_queries) == 1, (
+            'Эндпоинт `/api/v1/users/me/` должен выполнять один запрос к БД.'
+        )
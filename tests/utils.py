@@ -244,6 +244,30 @@ def create_titles(admin_client):
     return result, categories, genres
 
 
+def user_table_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if '"reviews_user"' in query['sql']
+    ]
+
+
+def user_queries_before_update(context, table):
+    queries = [query['sql'] for query in context.captured_queries]
+    update = next(
+        index for index, sql in enumerate(queries)
+        if sql.startswith(f'UPDATE "{table}"')
+    )
+    return [sql for sql in queries[:update] if '"reviews_user"' in sql]
+
+
+def write_path_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if not query['sql'].startswith(
+            ('BEGIN', 'SAVEPOINT', 'RELEASE'))
+    ]
+
+
 def create_reviews(admin_client, authors_map):
     titles, _, _ = create_titles(admin_client)
     result = []